@@ -0,0 +1,50 @@
+"""Fused topic + claim extraction prompt over several source texts.
+
+Applies the combined extraction rules to each delimited document
+independently, so one Gemini call serves several requests.
+Single placeholder: {documents} (texts introduced by <<<DOC N>>> markers)
+"""
+
+from src.config.prompts.combined_extraction import COMBINED_EXTRACTION_PROMPT
+
+# Steps and claim criteria of the combined prompt (contains no format braces)
+_RULES: str = COMBINED_EXTRACTION_PROMPT.split("OUTPUT FORMAT (STRICT)")[0]
+
+BATCHED_EXTRACTION_PROMPT: str = (
+    _RULES
+    + """MULTIPLE DOCUMENTS
+
+The source text below holds several independent documents, each introduced by a \
+<<<DOC N>>> marker where N is the document index. Apply every step above to each \
+document separately. Never move topics or claims from one document to another.
+
+OUTPUT FORMAT (STRICT)
+
+Return only valid JSON.
+
+{{
+  "documents": [
+    {{
+      "document": 0,
+      "topics": [
+        {{
+          "topic": "Concise topic label",
+          "claims": [
+            "Atomic, verifiable claim.",
+            "Another atomic claim."
+          ]
+        }}
+      ]
+    }}
+  ]
+}}
+
+Rules
+Return exactly one entry per document, with N from its <<<DOC N>>> marker.
+Order topics as they appear in each document.
+Drop any topic that ends up with fewer than two valid claims.
+Do not include explanations, metadata, or commentary.
+
+SOURCE DOCUMENTS
+{documents}"""
+)
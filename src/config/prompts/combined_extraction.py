@@ -0,0 +1,160 @@
+"""Fused topic + claim extraction prompt for Gemini structured output.
+
+Merges the topic extraction and claim extraction prompts so a single Gemini
+call identifies topics and extracts their claims together.
+Single placeholder: {source_text}
+"""
+
+COMBINED_EXTRACTION_PROMPT: str = """You are an expert content analyst and fact extraction \
+system. Your objective is to identify the topics of discussion in source text, in \
+chronological order, and to extract verifiable, atomic claims organized under those topics.
+
+You operate with high precision and zero hallucination tolerance.
+
+Inputs
+
+You will be provided with:
+
+source_text: the full source text (may be an article, research paper, report, interview, \
+or any other written content)
+
+STEP 1: TOPIC IDENTIFICATION
+
+1. Read the provided source text carefully from start to finish.
+2. Identify distinct, clearly defined topics of discussion as they naturally emerge.
+3. Detect topic boundaries by:
+   - Changes in subject matter
+   - New questions or arguments introduced
+   - Shifts in technical, economic, social, or strategic focus
+4. Assign each discussion segment a concise, descriptive, and simple topic label \
+(3-10 words), ensuring each label is clear and easy to understand at first glance.
+5. Preserve the order in which topics appear in the text.
+6. Merge adjacent segments if they clearly belong to the same topic to avoid redundancy.
+7. Only keep topics that contain multiple distinct claims or points. If a subject is only \
+touched on once with a single claim or point, do not generate a separate topic for it.
+
+Topic names must be:
+- General (not overly granular)
+- Specific (not overly vague like "Space" or "Technology")
+- Clear and simple on first reading
+- Directly supported by the source text (do not invent)
+
+Scale topic count to text length:
+- Extract 2-5 topics for short texts (under 1000 words)
+- Extract 4-8 topics for medium texts (1000-5000 words)
+- Extract 6-12 topics for long texts (over 5000 words)
+
+STEP 2: CLAIM SET ASSIGNMENT
+
+Iterate over the ordered list of topics from Step 1:
+    For each topic:
+        - Analyze the source text sequentially.
+        - Extract only claims that are specifically related to the current topic.
+        - Assign each extracted claim to this topic.
+
+If a claim could reasonably belong to multiple topics:
+    - Choose the topic that best matches the primary intent of the statement.
+
+If a claim does not clearly fit any topic, discard it.
+
+STEP 3: FACT EXTRACTION & REFINEMENT
+
+From the topic-aligned content, extract objective, verifiable claims.
+
+Criteria for Valid Claims
+
+Atomic
+- Each claim must express exactly one fact.
+- Split compound sentences into multiple claims.
+
+De-Referenced & Self-Contained (CRUCIAL)
+- The "Shuffle" Rule: Write every claim assuming it will be shuffled into a random order. \
+The reader will NOT see the Topic Name.
+- NO Shorthand for Main Subjects: If the topic is about a specific concept \
+(e.g., "Dollar Milkshake Theory"), you are PROHIBITED from referring to it as \
+"The theory," "The model," or "The framework." You must write the full name in every \
+single claim.
+    - BAD: "The theory predicted rising interest rates."
+    - GOOD: "The Dollar Milkshake Theory predicted rising rates."
+- Ban Generic Subjects: Never start a claim with "The company," "The founder," \
+"The legislation," or "The plan." Substitute these with the specific entity name \
+(e.g., "Santiago Capital," "Brent Johnson," "The Dodd-Frank Act").
+- Absolute Pronoun Replacement: Replace all pronouns (he, she, it, they) with explicit \
+entities.
+
+Attribution Stripping (Direct Assertions)
+- Remove Reporting Verbs: Do NOT preface claims with "The speaker said," \
+"Dr. [Name] stated," "He claimed," "They noted," or "[Name] cited evidence that."
+- Extract the Content, Not the Quote: Extract the fact itself, not the fact that \
+someone said it.
+    - BAD: "Dr. Mark Hyman stated that 60% of the American diet is ultra-processed."
+    - GOOD: "60% of the American diet consists of ultra-processed food."
+    - BAD: "He cited evidence that EMFs negatively affect fertility."
+    - GOOD: "EMFs from devices like laptops can negatively affect fertility."
+- Exception: If the claim is explicitly about the person's biography or actions \
+(e.g., "Dr. Mark Hyman founded Function Health"), keep the name as the subject.
+
+Temporally Accurate
+- Distinguish between when a fact happened and when it was simply discussed.
+- Do not imply a fact happened in a specific year if that year only refers to when it \
+was written about.
+- Event Preservation: If a fact is tied to an event (e.g., "Announced at CES 2026"), \
+preserve that specific context.
+
+Contextually Complete
+- Include: Names, Dates, Locations, Definitions (when necessary).
+- Zero-Context Requirement: If a user reads this claim on a flashcard with no other text, \
+they must understand exactly who and what is being discussed.
+
+Verifiable
+- Must be checkable against reliable external sources.
+- Do not extract: Opinions, Speculation, Personal feelings, Hypotheticals, Anecdotes \
+without factual grounding.
+
+Concise
+- 5-32 words per claim.
+
+WHAT TO EXTRACT
+ Empirical data and statistics
+ Historical events with specific actors
+ Biographical details (roles, dates, accomplishments)
+ Explicit causal claims stated as facts
+ Technical or scientific definitions
+
+CONTENT VALIDATION CHECKLIST
+
+Before finalizing each claim:
+- Does it contain exactly one factual assertion?
+- Does the claim start with "X stated," "X said," or "X claimed"? If yes, \
+REMOVE the attribution.
+- Does the claim start with a generic noun phrase like "The theory," "The report," \
+or "The strategy"? If yes, REPLACE it with the full proper name.
+- Are all pronouns replaced with specific named entities?
+- If I read this claim in isolation without seeing the Topic Name, do I know exactly \
+what it refers to?
+
+If any check fails, discard or rewrite the claim.
+
+OUTPUT FORMAT (STRICT)
+
+Return only valid JSON.
+
+{{
+  "topics": [
+    {{
+      "topic": "Concise topic label",
+      "claims": [
+        "Atomic, verifiable claim.",
+        "Another atomic claim."
+      ]
+    }}
+  ]
+}}
+
+Rules
+Order topics as they appear in the source text.
+Drop any topic that ends up with fewer than two valid claims.
+Do not include explanations, metadata, or commentary.
+
+SOURCE TEXT
+{source_text}"""
@@ -4,11 +4,13 @@ Loads configuration from environment variables using Pydantic Settings.
 All settings can be overridden via .env file or environment variables.
 
 Usage:
-    from src.config.settings import Settings
+    from src.config.settings import get_settings
 
-    settings = Settings()  # Instantiated via FastAPI lifespan, not at module level
+    settings = get_settings()  # Cached per process; first call reads env and .env
 """
 
+from functools import lru_cache
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -31,5 +33,80 @@ class Settings(BaseSettings):
     gemini_temperature: float = Field(
         default=0.2, description="Generation temperature"
     )
+    combined_extraction: bool = Field(
+        default=True,
+        description="Extract topics and claims in a single Gemini call "
+        "(false runs the two-step topics -> claims pipeline)",
+    )
+    claim_fanout_concurrency: int = Field(
+        default=0,
+        description="Max concurrent per-topic claim extraction calls in two-step mode "
+        "(0 extracts all topics in one call)",
+    )
+    min_words_for_topics: int = Field(
+        default=0,
+        description="In two-step mode, inputs with fewer words skip topic extraction "
+        "and use a single topic (0 disables)",
+    )
+    claim_chunk_chars: int = Field(
+        default=0,
+        description="In two-step mode, split longer inputs into paragraph chunks of this "
+        "many characters and extract their claims concurrently (0 disables)",
+    )
+    micro_batch_window_ms: int = Field(
+        default=0,
+        description="In combined mode, coalesce requests arriving within this many ms "
+        "into one multi-document Gemini call (0 disables). Texts from different callers "
+        "share one prompt, so enable only for a single trusted tenant",
+    )
+    micro_batch_max_size: int = Field(
+        default=8, description="Max source texts coalesced into one Gemini call"
+    )
+    response_cache_enabled: bool = Field(
+        default=False,
+        description="Cache parsed Gemini responses for identical prompts "
+        "(a regeneration within the TTL then returns the same result)",
+    )
+    response_cache_max_size: int = Field(
+        default=1024, description="Max cached Gemini responses (LRU eviction)"
+    )
+    response_cache_ttl_seconds: float = Field(
+        default=3600.0, description="Seconds a cached Gemini response stays valid"
+    )
+    gemini_rpm: int | None = Field(
+        default=None,
+        description="Client-side Gemini requests-per-minute budget (unset disables)",
+    )
+    gemini_tpm: int | None = Field(
+        default=None,
+        description="Client-side Gemini input tokens-per-minute budget (unset disables)",
+    )
+    gemini_max_concurrency: int | None = Field(
+        default=None,
+        description="Max Gemini calls in flight at once across all requests "
+        "(unset disables)",
+    )
+    batch_mode: bool = Field(
+        default=False,
+        description="Send Gemini calls through the Batch API (half cost, async SLA; "
+        "for non-interactive bulk workloads only). Each /generate/claims request "
+        "stays open until its job finishes, so clients and proxies need timeouts "
+        "above BATCH_TIMEOUT_SECONDS",
+    )
+    batch_timeout_seconds: float = Field(
+        default=3600.0,
+        description="In batch mode, cancel a job and return 502 after this many seconds",
+    )
+    cors_origins: list[str] = Field(
+        default=[],
+        description='Origins allowed to call the API cross-origin, as a JSON list '
+        '(e.g. ["https://app.example.com"]); empty allows same-origin only',
+    )
     port: int = Field(default=8000, description="API server port (Railway sets via PORT)")
     log_level: str = Field(default="INFO", description="Logging level")
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings once per process; call get_settings.cache_clear() to reload."""
+    return Settings()
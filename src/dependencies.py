@@ -1,8 +1,9 @@
-"""FastAPI dependency injection for service instances.
+"""Service instance lookup for route handlers.
 
-Provides configured service instances to route handlers via FastAPI's
-Depends() mechanism. All instances are created during app lifespan and
-stored on app.state for singleton behavior.
+All instances are created during app lifespan and stored on app.state for
+singleton behavior. Handlers read them with a direct call rather than
+Depends(): a plain sync dependency would be dispatched to the threadpool
+on every request just to read one attribute.
 """
 
 from fastapi import HTTPException, Request, status
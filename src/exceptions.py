@@ -35,6 +35,15 @@ class EmptyExtractionError(ExtractionError):
         super().__init__(detail=detail)
 
 
+class StreamingUnavailableError(HTTPException):
+    """Streaming requested while Gemini calls go through the Batch API."""
+
+    def __init__(
+        self, detail: str = "Streaming is unavailable in batch mode; use /generate/claims"
+    ) -> None:
+        super().__init__(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=detail)
+
+
 class InputValidationError(HTTPException):
     """Invalid source text input."""
 
@@ -0,0 +1,44 @@
+"""Shared Gemini request config for the extractors.
+
+GenerateContentConfig is a Pydantic model, so it is built once per
+(schema, temperature, max_output_tokens) and reused by every extractor
+instance instead of being re-validated per instance.
+
+The response schema is sent as a precomputed JSON Schema dict via
+response_json_schema, which the SDK forwards untouched. Passing the Pydantic
+class as response_schema makes the SDK regenerate and convert the schema on
+every request. In exchange, response.parsed is a plain dict rather than a
+model, so the extractors validate response.text directly instead.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from google.genai import types
+
+from src.extraction._safety import SAFETY_SETTINGS
+
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+
+@lru_cache(maxsize=8)
+def build_config(
+    schema: type[BaseModel],
+    temperature: float,
+    max_output_tokens: int | None = None,
+) -> types.GenerateContentConfig:
+    """Return the shared structured-output config for a response schema.
+
+    The returned config is shared between callers and must not be mutated;
+    use model_copy(update=...) for per-call overrides.
+    """
+    return types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_json_schema=schema.model_json_schema(),
+        temperature=temperature,
+        max_output_tokens=max_output_tokens,
+        safety_settings=list(SAFETY_SETTINGS),
+    )
@@ -0,0 +1,126 @@
+"""Shared parsing of Gemini structured-output responses.
+
+Every extractor recovers its result schema through the same chain: a
+direct parse of the response text, an outermost-JSON scan
+for output wrapped in code fences or prose, a partial parse for truncated
+output, and finally json_repair.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from json_repair import repair_json
+from pydantic import BaseModel, ValidationError
+
+from src.exceptions import ExtractionError
+from src.utils.json_scan import extract_outermost_json, parse_partial_json
+
+logger = logging.getLogger(__name__)
+
+
+def parse_structured[ResultT: BaseModel](
+    response: Any, schema: type[ResultT], label: str
+) -> ResultT:
+    """Parse a Gemini response into schema.
+
+    Args:
+        response: The generate_content response.
+        schema: The result model the response was requested in.
+        label: What was extracted (e.g. "claim extraction"), for messages.
+
+    Raises:
+        ExtractionError: If the response has no text or cannot be parsed.
+    """
+    parsed = getattr(response, "parsed", None)
+    if isinstance(parsed, schema):
+        return parsed
+
+    # The schema is sent as a JSON Schema dict, so .parsed is only the SDK's
+    # json.loads dict: validating the text directly skips building the model
+    # from that intermediate dict
+    text: str | None = response.text
+    if text is not None:
+        return parse_structured_text(text, schema, label)
+
+    if parsed is not None:
+        try:
+            return schema.model_validate(parsed)
+        except ValidationError as exc:
+            raise ExtractionError(f"Failed to parse {label} response: {exc}") from exc
+
+    logger.error(
+        "Gemini returned no text; finish_reason=%s",
+        response.candidates[0].finish_reason if response.candidates else "N/A",
+    )
+    raise ExtractionError(f"Failed to parse {label} response: empty text")
+
+
+def _validate_partial[ResultT: BaseModel](data: Any, schema: type[ResultT]) -> ResultT:
+    """Validate partially parsed JSON, dropping list items cut off by the truncation.
+
+    Closing a truncated value leaves its last list element incomplete, e.g.
+    {"topics": [{...}, {"top  parses to {"topics": [{...}, {}]}. Only a
+    failing element that is last in its list is dropped, one per pass.
+    """
+    while True:
+        try:
+            return schema.model_validate(data)
+        except ValidationError as exc:
+            if not any(_drop_last_item(data, error["loc"]) for error in exc.errors()):
+                raise
+
+
+def _drop_last_item(data: Any, loc: tuple[int | str, ...]) -> bool:
+    """Remove the element at loc's first list index if it is that list's last one."""
+    container = data
+    for key in loc:
+        if isinstance(key, int) and isinstance(container, list):
+            if key != len(container) - 1:
+                return False
+            container.pop()
+            return True
+        if not isinstance(container, dict) or key not in container:
+            return False
+        container = container[key]
+    return False
+
+
+def parse_structured_text[ResultT: BaseModel](
+    text: str, schema: type[ResultT], label: str
+) -> ResultT:
+    """Parse raw response text into schema.
+
+    Raises:
+        ExtractionError: If no stage of the chain yields a valid result.
+    """
+    # Try direct parse, then outermost-JSON scan, then JSON repair fallback
+    try:
+        return schema.model_validate_json(text)
+    except Exception as direct_exc:
+        logger.warning("Direct JSON parse failed, attempting repair: %s", direct_exc)
+
+    # Single O(n) pass recovers JSON wrapped in code fences or prose
+    candidate = extract_outermost_json(text)
+    if candidate is not None and candidate != text:
+        try:
+            return schema.model_validate_json(candidate)
+        except Exception as scan_exc:
+            logger.warning("Outermost JSON parse failed: %s", scan_exc)
+
+    # Truncated output: pydantic-core closes it natively, far cheaper than repair.
+    # Only unclosed JSON is truncated, so complete JSON never loses list items
+    partial = parse_partial_json(text) if candidate is None else None
+    if partial is not None:
+        try:
+            return _validate_partial(partial, schema)
+        except ValidationError as partial_exc:
+            logger.warning("Partial JSON parse failed: %s", partial_exc)
+
+    try:
+        repaired = repair_json(text)
+        return schema.model_validate_json(repaired)
+    except Exception as exc:
+        logger.error("%s response parse failed after repair: %s", label.capitalize(), exc)
+        raise ExtractionError(f"Failed to parse {label} response: {exc}") from exc
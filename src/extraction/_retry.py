@@ -0,0 +1,81 @@
+"""Shared tenacity retry policy for the Gemini extractors."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from google.genai import errors as genai_errors
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+from tenacity.wait import wait_base
+
+from src.exceptions import ExtractionError, SafetyFilterError
+from src.extraction.rate_limiter import retry_after_seconds
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from tenacity import RetryCallState
+
+_MAX_ATTEMPTS = 3
+
+# SafetyFilterError subclasses ExtractionError, so it is checked first
+_NON_RETRYABLE_TYPES = (SafetyFilterError,)
+# ExtractionError: non-deterministic malformed JSON from Gemini
+_RETRYABLE_TYPES = (ExtractionError, genai_errors.ServerError)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Check if an exception is retryable.
+
+    Retries on:
+    - Gemini 429 rate limit or 5xx server errors
+    - ExtractionError (non-deterministic malformed JSON from Gemini)
+
+    Does NOT retry SafetyFilterError (content blocked — deterministic).
+    """
+    if isinstance(exc, _NON_RETRYABLE_TYPES):
+        return False
+    if isinstance(exc, _RETRYABLE_TYPES):
+        return True
+    return isinstance(exc, genai_errors.ClientError) and exc.code == 429
+
+
+class WaitRetryAfter(wait_base):
+    """Wait at least as long as the server asked, else fall back to jittered backoff.
+
+    Gemini 429s carry a retry delay; sleeping exactly that long avoids both
+    retrying too early and overshooting. Jitter in the fallback keeps
+    concurrent clients from retrying in lockstep.
+    """
+
+    def __init__(self, fallback: wait_base) -> None:
+        self._fallback = fallback
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        default = self._fallback(retry_state)
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        delay = retry_after_seconds(exc) if exc is not None else None
+        return default if delay is None else max(delay, default)
+
+
+RETRY_WAIT = WaitRetryAfter(wait_random_exponential(multiplier=1, min=2, max=30))
+
+
+async def call_with_retry[T](
+    call: Callable[..., Awaitable[T]],
+    *args: Any,
+    batch_mode: bool = False,
+    retryable: Callable[[BaseException], bool] = is_retryable,
+) -> T:
+    """Await call(*args) under the shared retry policy.
+
+    Batch jobs get a single attempt: a failed, expired or unparseable job
+    would otherwise be resubmitted, and each resubmission can take hours.
+    """
+    retrying = AsyncRetrying(
+        stop=stop_after_attempt(1 if batch_mode else _MAX_ATTEMPTS),
+        wait=RETRY_WAIT,
+        retry=retry_if_exception(retryable),
+        reraise=True,
+    )
+    return await retrying(call, *args)
@@ -0,0 +1,16 @@
+"""Gemini safety settings shared by every extraction request."""
+
+from __future__ import annotations
+
+from google.genai import types
+
+# All filters off: curators extract claims from political/health/violence content
+SAFETY_SETTINGS: tuple[types.SafetySetting, ...] = tuple(
+    types.SafetySetting(category=category, threshold=types.HarmBlockThreshold.BLOCK_NONE)
+    for category in (
+        types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
+        types.HarmCategory.HARM_CATEGORY_HARASSMENT,
+        types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
+        types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
+    )
+)
@@ -0,0 +1,138 @@
+"""Streaming Gemini calls with incremental parsing of array items.
+
+Items of the response's top-level array are validated and yielded as soon
+as their JSON closes, so callers can use early topics while Gemini is
+still decoding later ones.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING
+
+from google.genai import types
+from pydantic import BaseModel, ValidationError
+
+from src.exceptions import ExtractionError, SafetyFilterError
+from src.extraction._retry import call_with_retry, is_retryable
+from src.extraction.rate_limiter import throttle
+from src.utils.json_scan import ArrayItemScanner
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+
+    from google import genai
+
+    from src.extraction.rate_limiter import GeminiRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+async def stream_array_items[ItemT: BaseModel](
+    client: genai.Client,
+    model: str,
+    prompt: str,
+    config: types.GenerateContentConfig,
+    item_type: type[ItemT],
+    fallback: Callable[[str], list[ItemT]],
+    *,
+    rate_limiter: GeminiRateLimiter | None,
+    label: str,
+) -> AsyncIterator[ItemT]:
+    """Stream a Gemini response, yielding array items as they complete.
+
+    If no item could be parsed incrementally (e.g. output wrapped in prose),
+    or an item fails validation, the full buffered text is handed to
+    fallback once the stream ends, and the items not yet yielded come from it.
+    Failures before the first item are retried under the shared policy;
+    after that items may already have been consumed, so errors propagate.
+    A background task drains the response into a buffer, so a slow consumer
+    never holds the rate limiter's concurrency slot.
+
+    A truncated response (output token limit) is a partial stream: items
+    completed before the cut are yielded except the last, then
+    ExtractionError is raised.
+
+    Raises:
+        SafetyFilterError: If a chunk reports a safety block.
+        ExtractionError: If the response was truncated, or fallback fails.
+    """
+    produced = 0
+    rescan = False
+    chunks: list[str] = []
+    # None marks the end of the response
+    buffer: asyncio.Queue[ItemT | None] = asyncio.Queue()
+
+    async def _read() -> None:
+        nonlocal rescan
+        # A retried attempt starts over from an empty response
+        scanner = ArrayItemScanner()
+        chunks.clear()
+        rescan = False
+        async with throttle(rate_limiter, prompt):
+            stream = await client.aio.models.generate_content_stream(
+                model=model,
+                contents=prompt,
+                config=config,
+            )
+            async for chunk in stream:
+                finish_reason = chunk.candidates[0].finish_reason if chunk.candidates else None
+                if finish_reason == types.FinishReason.SAFETY:
+                    raise SafetyFilterError()
+                text = chunk.text
+                if text:
+                    chunks.append(text)
+                    if not rescan:
+                        _feed(scanner, text)
+                if finish_reason == types.FinishReason.MAX_TOKENS:
+                    # Raised as soon as it is known; only the cut-off tail is lost
+                    raise ExtractionError(
+                        f"{label} response truncated (output token limit reached)"
+                    )
+
+    def _feed(scanner: ArrayItemScanner, text: str) -> None:
+        nonlocal produced, rescan
+        for item_json in scanner.feed(text):
+            try:
+                item = item_type.model_validate_json(item_json)
+            except ValidationError as exc:
+                # Dropping it would return an incomplete result as a success
+                logger.warning("Streamed item invalid, parsing full response: %s", exc)
+                rescan = True
+                return
+            buffer.put_nowait(item)
+            produced += 1
+
+    async def _drain() -> None:
+        try:
+            await call_with_retry(
+                _read, retryable=lambda exc: not produced and is_retryable(exc)
+            )
+        finally:
+            buffer.put_nowait(None)
+
+    drain = asyncio.create_task(_drain())
+    # The newest item is held back until the next one arrives, so a response
+    # with a single item fails before anything is yielded
+    pending: ItemT | None = None
+    try:
+        while (item := await buffer.get()) is not None:
+            if pending is not None:
+                yield pending
+            pending = item
+        # Re-raise whatever ended the response early, before the last item
+        await drain
+    finally:
+        drain.cancel()
+        # Retrieve the outcome of a drain the consumer abandoned
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await drain
+
+    if pending is not None:
+        yield pending
+    if rescan or not produced:
+        # The full parse repeats the items already yielded first, so skip them
+        for item in fallback("".join(chunks))[produced:]:
+            yield item
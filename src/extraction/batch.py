@@ -0,0 +1,95 @@
+"""Gemini Batch API calls for non-interactive workloads.
+
+Batch jobs are billed at about half the price of interactive calls, in
+exchange for an asynchronous SLA (minutes to hours). Each call submits a
+one-request inline job and polls it with exponential backoff until it
+reaches a terminal state or the caller's timeout, which cancels the job;
+jobs that never run expire server-side.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING
+
+from google.genai import errors as genai_errors
+from google.genai import types
+
+from src.exceptions import LLMProviderError
+
+if TYPE_CHECKING:
+    from google import genai
+
+logger = logging.getLogger(__name__)
+
+_POLL_INITIAL_SECONDS = 5.0
+_POLL_MAX_SECONDS = 60.0
+
+_FAILED_STATES = frozenset(
+    {
+        types.JobState.JOB_STATE_FAILED,
+        types.JobState.JOB_STATE_CANCELLED,
+        types.JobState.JOB_STATE_EXPIRED,
+    }
+)
+_DONE_STATES = _FAILED_STATES | {
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+}
+
+
+async def generate_content_batch(
+    client: genai.Client,
+    model: str,
+    prompt: str,
+    config: types.GenerateContentConfig,
+    timeout: float | None = None,
+) -> types.GenerateContentResponse:
+    """Run one generate_content request through the Batch API.
+
+    Args:
+        timeout: Seconds to wait for the job before cancelling it (None waits
+            until the job finishes or expires server-side).
+
+    Returns:
+        The GenerateContentResponse of the single inlined request.
+
+    Raises:
+        LLMProviderError: If the job or its request fails, is cancelled,
+            expires, or outlasts timeout.
+    """
+    job = await client.aio.batches.create(
+        model=model,
+        src=[types.InlinedRequest(contents=prompt, config=config)],
+        config=types.CreateBatchJobConfig(display_name="claim-extraction"),
+    )
+    logger.info("Submitted Gemini batch job %s", job.name)
+
+    delay = _POLL_INITIAL_SECONDS
+    try:
+        async with asyncio.timeout(timeout):
+            while job.state not in _DONE_STATES:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _POLL_MAX_SECONDS)
+                job = await client.aio.batches.get(name=job.name or "")
+    except TimeoutError:
+        # Nobody is waiting for the result any more, so stop the job
+        with contextlib.suppress(genai_errors.APIError):
+            await client.aio.batches.cancel(name=job.name or "")
+        raise LLMProviderError(
+            detail=f"Gemini batch job {job.name} did not finish within {timeout:g}s"
+        ) from None
+
+    if job.state in _FAILED_STATES:
+        message = job.error.message if job.error else None
+        raise LLMProviderError(detail=f"Gemini batch job {job.state}: {message}")
+
+    inlined = job.dest.inlined_responses if job.dest else None
+    if not inlined:
+        raise LLMProviderError(detail=f"Gemini batch job {job.name} returned no responses")
+    if inlined[0].error is not None or inlined[0].response is None:
+        message = inlined[0].error.message if inlined[0].error else None
+        raise LLMProviderError(detail=f"Gemini batch request failed: {message}")
+    return inlined[0].response
@@ -3,87 +3,106 @@
 Extracts atomic, self-contained claims organized by topic from source text.
 Retries on transient Gemini errors (429 rate limit, 5xx server errors)
 and non-deterministic parse failures (malformed JSON from Gemini).
+Optionally fans out one Gemini call per topic, run concurrently.
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING
 
-from google.genai import errors as genai_errors
 from google.genai import types
-from json_repair import repair_json
-from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+from pydantic_core import to_json
 
 from src.config.prompts.claim_extraction import CLAIM_EXTRACTION_PROMPT
-from src.exceptions import ExtractionError, SafetyFilterError
+from src.exceptions import ExtractionError, SafetyFilterError, StreamingUnavailableError
+from src.extraction._config import build_config
+from src.extraction._parse import parse_structured, parse_structured_text
+from src.extraction._retry import call_with_retry
+from src.extraction._streaming import stream_array_items
+from src.extraction.batch import generate_content_batch
+from src.extraction.rate_limiter import throttle
 from src.schemas.llm import ClaimWithTopicBaseResult, ClaimWithTopicResult
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
     from google import genai
 
+    from src.extraction.rate_limiter import GeminiRateLimiter
+    from src.utils.cache import ResponseCache
+
 logger = logging.getLogger(__name__)
 
+# Split the template once at import so each request is a single concatenation
+_PROMPT_HEAD, _PROMPT_MIDDLE, _PROMPT_TAIL = CLAIM_EXTRACTION_PROMPT.format(
+    topics="\0", source_text="\0"
+).split("\0")
+
+
+# Output budget: the full cap, or a per-topic allowance when that is smaller.
+# A response truncated at the per-topic allowance is retried once at the full cap
+_MAX_OUTPUT_TOKENS = 8192
+_OUTPUT_TOKENS_PER_TOPIC = 400
+_OUTPUT_TOKENS_BASE = 512
+
+
+def _output_token_cap(topic_count: int) -> int:
+    """Scale max_output_tokens with the number of topics to extract claims for."""
+    return min(_MAX_OUTPUT_TOKENS, _OUTPUT_TOKENS_PER_TOPIC * topic_count + _OUTPUT_TOKENS_BASE)
 
-def _is_retryable(exc: BaseException) -> bool:
-    """Check if an exception is retryable.
 
-    Retries on:
-    - Gemini 429 rate limit or 5xx server errors
-    - ExtractionError (non-deterministic malformed JSON from Gemini)
+def _finish_reason(response: types.GenerateContentResponse) -> types.FinishReason | None:
+    """Return the first candidate's finish reason, if any."""
+    return response.candidates[0].finish_reason if response.candidates else None
 
-    Does NOT retry SafetyFilterError (content blocked — deterministic).
-    """
-    if isinstance(exc, SafetyFilterError):
-        return False
-    if isinstance(exc, ExtractionError):
-        return True
-    if isinstance(exc, genai_errors.ServerError):
-        return True
-    if isinstance(exc, genai_errors.ClientError):
-        return cast("bool", getattr(exc, "code", 0) == 429)
-    return False
+
+def _build_prompt(source_text: str, topics_json: str) -> str:
+    """Fill the claim extraction template (topics come before the source text)."""
+    return "".join((_PROMPT_HEAD, topics_json, _PROMPT_MIDDLE, source_text, _PROMPT_TAIL))
 
 
 class ClaimExtractor:
     """Extracts claims organized by topic from source text via Gemini."""
 
     def __init__(
-        self, client: genai.Client, model: str, temperature: float
+        self,
+        client: genai.Client,
+        model: str,
+        temperature: float,
+        fanout_concurrency: int = 0,
+        cache: ResponseCache | None = None,
+        rate_limiter: GeminiRateLimiter | None = None,
+        batch_mode: bool = False,
+        batch_timeout: float | None = None,
     ) -> None:
         self._client = client
         self._model = model
-        self._config = types.GenerateContentConfig(
-            response_mime_type="application/json",
-            response_schema=ClaimWithTopicResult,
-            temperature=temperature,
-            max_output_tokens=8192,
-            safety_settings=[
-                types.SafetySetting(
-                    category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                    threshold=types.HarmBlockThreshold.BLOCK_NONE,
-                ),
-                types.SafetySetting(
-                    category=types.HarmCategory.HARM_CATEGORY_HARASSMENT,
-                    threshold=types.HarmBlockThreshold.BLOCK_NONE,
-                ),
-                types.SafetySetting(
-                    category=types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-                    threshold=types.HarmBlockThreshold.BLOCK_NONE,
-                ),
-                types.SafetySetting(
-                    category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                    threshold=types.HarmBlockThreshold.BLOCK_NONE,
-                ),
-            ],
+        self._cache = cache
+        self._rate_limiter = rate_limiter
+        self._batch_mode = batch_mode
+        self._batch_timeout = batch_timeout
+        # Per-topic fan-out is disabled when no concurrency budget is given
+        self._fanout = (
+            asyncio.Semaphore(fanout_concurrency) if fanout_concurrency > 0 else None
+        )
+        self._config = build_config(
+            ClaimWithTopicResult, temperature, max_output_tokens=_MAX_OUTPUT_TOKENS
         )
+        # One config per output cap, so repeat topic counts reuse the same object
+        self._capped_configs: dict[int, types.GenerateContentConfig] = {
+            _MAX_OUTPUT_TOKENS: self._config
+        }
 
     async def extract(
         self, source_text: str, topics: list[str]
     ) -> list[ClaimWithTopicBaseResult]:
         """Extract claims from source text organized by the given topics.
 
+        With fan-out enabled, each topic gets its own concurrent Gemini call
+        (bounded by the fan-out semaphore) instead of one call for all topics.
+
         Args:
             source_text: The raw text to extract claims from.
             topics: Ordered list of topic labels to organize claims under.
@@ -95,27 +114,153 @@ class ClaimExtractor:
             SafetyFilterError: If content is blocked by Gemini safety filters.
             ExtractionError: If response cannot be parsed after retries.
         """
-        topics_json = json.dumps(topics)
-        prompt = CLAIM_EXTRACTION_PROMPT.format(
-            source_text=source_text, topics=topics_json
-        )
-        result = await self._call_and_parse(prompt)
+        if self._fanout is not None and len(topics) > 1:
+            return await self._extract_per_topic(source_text, topics, self._fanout)
+
+        prompt = _build_prompt(source_text, to_json(topics).decode())
+        result = await self._call_cached(prompt, self._config_for(len(topics)))
         return result.claim_topics
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=30),
-        retry=retry_if_exception(_is_retryable),
-        reraise=True,
-    )
-    async def _call_and_parse(self, prompt: str) -> ClaimWithTopicResult:
+    async def extract_stream(
+        self, source_text: str, topics: list[str]
+    ) -> AsyncIterator[ClaimWithTopicBaseResult]:
+        """Stream claims per topic as Gemini finishes decoding each topic.
+
+        With fan-out enabled, topics are extracted by the same concurrent
+        per-topic calls as extract and yielded as each call finishes.
+
+        Args:
+            source_text: The raw text to extract claims from.
+            topics: Ordered list of topic labels to organize claims under.
+
+        Yields:
+            ClaimWithTopicBaseResult per topic: in topic order from a single
+            streamed call, in completion order with fan-out.
+
+        Raises:
+            SafetyFilterError: If content is blocked by Gemini safety filters.
+            ExtractionError: If the response is truncated or cannot be parsed.
+            StreamingUnavailableError: In batch mode.
+        """
+        if self._batch_mode:
+            # A batch job returns everything at once, hours later: not a stream
+            raise StreamingUnavailableError()
+
+        if self._fanout is not None and len(topics) > 1:
+            fanout = self._fanout
+            tasks = [
+                asyncio.ensure_future(self._extract_topic(source_text, topic, fanout))
+                for topic in topics
+            ]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    yield await next_done
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            return
+
+        prompt = _build_prompt(source_text, to_json(topics).decode())
+        # Streamed items cannot be taken back, so use the full cap up front
+        async for item in stream_array_items(
+            self._client,
+            self._model,
+            prompt,
+            self._config,
+            ClaimWithTopicBaseResult,
+            lambda text: parse_structured_text(
+                text, ClaimWithTopicResult, "claim extraction"
+            ).claim_topics,
+            rate_limiter=self._rate_limiter,
+            label="Claim extraction",
+        ):
+            yield item
+
+    async def _extract_per_topic(
+        self, source_text: str, topics: list[str], fanout: asyncio.Semaphore
+    ) -> list[ClaimWithTopicBaseResult]:
+        """Extract claims with one concurrent Gemini call per topic."""
+        # gather preserves argument order, so results stay in topic order
+        return list(
+            await asyncio.gather(
+                *(self._extract_topic(source_text, topic, fanout) for topic in topics)
+            )
+        )
+
+    async def _extract_topic(
+        self, source_text: str, topic: str, fanout: asyncio.Semaphore
+    ) -> ClaimWithTopicBaseResult:
+        """Extract one topic's claims in its own call, within the fan-out budget."""
+        prompt = _build_prompt(source_text, to_json([topic]).decode())
+        async with fanout:
+            result = await self._call_cached(prompt, self._config_for(1))
+        # Pin the label to the requested topic in case Gemini rewords it
+        claims = [claim for item in result.claim_topics for claim in item.claims]
+        return ClaimWithTopicBaseResult(topic=topic, claims=claims)
+
+    def _config_for(self, topic_count: int) -> types.GenerateContentConfig:
+        """Return the shared config with max_output_tokens scaled to topic_count."""
+        cap = _output_token_cap(topic_count)
+        config = self._capped_configs.get(cap)
+        if config is None:
+            config = self._config.model_copy(update={"max_output_tokens": cap})
+            self._capped_configs[cap] = config
+        return config
+
+    async def _call_cached(
+        self, prompt: str, config: types.GenerateContentConfig
+    ) -> ClaimWithTopicResult:
+        """Serve identical prompts from the response cache when one is configured."""
+        if self._cache is None:
+            return await self._call_and_parse(prompt, config)
+        # The topic count (and so the output cap) is part of the prompt
+        key = self._cache.make_key(
+            self._model, repr(config.temperature), "ClaimWithTopicResult", prompt
+        )
+        return await self._cache.get_or_compute(
+            key, lambda: self._call_and_parse(prompt, config)
+        )
+
+    async def _generate(
+        self, prompt: str, config: types.GenerateContentConfig
+    ) -> types.GenerateContentResponse:
+        """Make one Gemini call, through the Batch API in batch mode."""
+        if self._batch_mode:
+            # Batch quota is separate from the interactive RPM/TPM budgets
+            return await generate_content_batch(
+                self._client, self._model, prompt, config, timeout=self._batch_timeout
+            )
+        async with throttle(self._rate_limiter, prompt):
+            return await self._client.aio.models.generate_content(
+                model=self._model,
+                contents=prompt,
+                config=config,
+            )
+
+    async def _call_and_parse(
+        self, prompt: str, config: types.GenerateContentConfig
+    ) -> ClaimWithTopicResult:
         """Call Gemini and parse the response, with retry on transient failures."""
-        response = await self._client.aio.models.generate_content(
-            model=self._model,
-            contents=prompt,
-            config=self._config,
+        return await call_with_retry(
+            self._call_once, prompt, config, batch_mode=self._batch_mode
         )
 
+    async def _call_once(
+        self, prompt: str, config: types.GenerateContentConfig
+    ) -> ClaimWithTopicResult:
+        """Make one attempt at calling Gemini and parsing the response."""
+        response = await self._generate(prompt, config)
+        truncated = _finish_reason(response) == types.FinishReason.MAX_TOKENS
+        if truncated and config is not self._config:
+            # The scaled cap was too small for this input: retry once at the full cap
+            logger.warning(
+                "Claim extraction hit its %s-token cap, retrying at %d",
+                config.max_output_tokens,
+                _MAX_OUTPUT_TOKENS,
+            )
+            response = await self._generate(prompt, self._config)
+
         # Check finish reason for blocking or truncation
         if response.candidates:
             finish_reason = response.candidates[0].finish_reason
@@ -126,40 +271,4 @@ class ClaimExtractor:
                     "Claim extraction response truncated (output token limit reached)"
                 )
 
-        return self._parse_response(response)
-
-    def _parse_response(self, response: Any) -> ClaimWithTopicResult:
-        """Parse Gemini response into ClaimWithTopicResult."""
-        # Try .parsed first (typed structured output)
-        try:
-            parsed: ClaimWithTopicResult | None = cast(
-                "ClaimWithTopicResult | None", response.parsed
-            )
-            if parsed is not None:
-                return parsed
-        except Exception:
-            logger.warning("response.parsed access failed, falling back to text")
-
-        # Fall back to manual JSON parsing from response text
-        text: str | None = response.text
-        if text is None:
-            logger.error(
-                "Gemini returned no text; finish_reason=%s",
-                response.candidates[0].finish_reason if response.candidates else "N/A",
-            )
-            raise ExtractionError("Failed to parse claim extraction response: empty text")
-
-        # Try direct parse, then JSON repair fallback
-        try:
-            return ClaimWithTopicResult.model_validate_json(text)
-        except Exception as direct_exc:
-            logger.warning("Direct JSON parse failed, attempting repair: %s", direct_exc)
-
-        try:
-            repaired = repair_json(text)
-            return ClaimWithTopicResult.model_validate_json(repaired)
-        except Exception as exc:
-            logger.error("Claim response parse failed after repair: %s", exc)
-            raise ExtractionError(
-                f"Failed to parse claim extraction response: {exc}"
-            ) from exc
+        return parse_structured(response, ClaimWithTopicResult, "claim extraction")
@@ -0,0 +1,198 @@
+"""Fused topic + claim extraction from source text using Gemini structured output.
+
+Identifies topics and extracts their claims in a single Gemini call, saving the
+extra round-trip (and second prefill of the source text) of the two-step pipeline.
+extract_many does the same for several source texts in one call.
+Retries on transient Gemini errors (429 rate limit, 5xx server errors)
+and non-deterministic parse failures (malformed JSON from Gemini).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from google.genai import types
+from pydantic import BaseModel
+
+from src.config.prompts.batched_extraction import BATCHED_EXTRACTION_PROMPT
+from src.config.prompts.combined_extraction import COMBINED_EXTRACTION_PROMPT
+from src.exceptions import ExtractionError, SafetyFilterError, StreamingUnavailableError
+from src.extraction._config import build_config
+from src.extraction._parse import parse_structured, parse_structured_text
+from src.extraction._retry import call_with_retry
+from src.extraction._streaming import stream_array_items
+from src.extraction.batch import generate_content_batch
+from src.extraction.rate_limiter import throttle
+from src.schemas.llm import (
+    ClaimWithTopicBaseResult,
+    DocumentsWithClaimsResult,
+    TopicsWithClaimsResult,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from google import genai
+
+    from src.extraction.rate_limiter import GeminiRateLimiter
+    from src.utils.cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# Split the template once at import so each request is a single concatenation
+_PROMPT_HEAD, _PROMPT_TAIL = COMBINED_EXTRACTION_PROMPT.format(source_text="\0").split("\0")
+_BATCHED_HEAD, _BATCHED_TAIL = BATCHED_EXTRACTION_PROMPT.format(documents="\0").split("\0")
+
+
+class CombinedExtractor:
+    """Extracts topics and their claims from source text in one Gemini call."""
+
+    def __init__(
+        self,
+        client: genai.Client,
+        model: str,
+        temperature: float,
+        cache: ResponseCache | None = None,
+        rate_limiter: GeminiRateLimiter | None = None,
+        batch_mode: bool = False,
+        batch_timeout: float | None = None,
+    ) -> None:
+        self._client = client
+        self._model = model
+        self._cache = cache
+        self._rate_limiter = rate_limiter
+        self._batch_mode = batch_mode
+        self._batch_timeout = batch_timeout
+        self._config = build_config(TopicsWithClaimsResult, temperature, max_output_tokens=8192)
+        # Several documents' claims need more room: use the model's output limit
+        self._batched_config = build_config(DocumentsWithClaimsResult, temperature)
+
+    async def extract(self, source_text: str) -> list[ClaimWithTopicBaseResult]:
+        """Extract topics and their claims from source text.
+
+        Args:
+            source_text: The raw text to extract topics and claims from.
+
+        Returns:
+            List of ClaimWithTopicBaseResult in topic order, one per topic.
+
+        Raises:
+            SafetyFilterError: If content is blocked by Gemini safety filters.
+            ExtractionError: If response cannot be parsed after retries.
+        """
+        prompt = "".join((_PROMPT_HEAD, source_text, _PROMPT_TAIL))
+        result = await self._call_cached(prompt)
+        return result.topics
+
+    async def extract_many(
+        self, source_texts: list[str]
+    ) -> list[list[ClaimWithTopicBaseResult]]:
+        """Extract topics and claims for several source texts in one Gemini call.
+
+        Args:
+            source_texts: Independent raw texts to extract topics and claims from.
+
+        Returns:
+            One list of ClaimWithTopicBaseResult per source text, in input order.
+            A document Gemini left out of its response gets an empty list.
+
+        Raises:
+            SafetyFilterError: If content is blocked by Gemini safety filters.
+            ExtractionError: If response cannot be parsed after retries.
+        """
+        if len(source_texts) == 1:
+            return [await self.extract(source_texts[0])]
+
+        documents = "\n\n".join(
+            f"<<<DOC {index}>>>\n{text}" for index, text in enumerate(source_texts)
+        )
+        prompt = "".join((_BATCHED_HEAD, documents, _BATCHED_TAIL))
+        result = await self._call_and_parse(
+            prompt, DocumentsWithClaimsResult, self._batched_config
+        )
+        by_document = {item.document: item.topics for item in result.documents}
+        return [by_document.get(index, []) for index in range(len(source_texts))]
+
+    async def extract_stream(
+        self, source_text: str
+    ) -> AsyncIterator[ClaimWithTopicBaseResult]:
+        """Stream topics with their claims as Gemini finishes decoding each one.
+
+        Args:
+            source_text: The raw text to extract topics and claims from.
+
+        Yields:
+            ClaimWithTopicBaseResult per topic, in topic order.
+
+        Raises:
+            SafetyFilterError: If content is blocked by Gemini safety filters.
+            ExtractionError: If the response is truncated or cannot be parsed.
+            StreamingUnavailableError: In batch mode.
+        """
+        if self._batch_mode:
+            # A batch job returns everything at once, hours later: not a stream
+            raise StreamingUnavailableError()
+
+        prompt = "".join((_PROMPT_HEAD, source_text, _PROMPT_TAIL))
+        async for item in stream_array_items(
+            self._client,
+            self._model,
+            prompt,
+            self._config,
+            ClaimWithTopicBaseResult,
+            lambda text: parse_structured_text(
+                text, TopicsWithClaimsResult, "combined extraction"
+            ).topics,
+            rate_limiter=self._rate_limiter,
+            label="Combined extraction",
+        ):
+            yield item
+
+    async def _call_cached(self, prompt: str) -> TopicsWithClaimsResult:
+        """Serve identical prompts from the response cache when one is configured."""
+        if self._cache is None:
+            return await self._call_and_parse(prompt, TopicsWithClaimsResult, self._config)
+        key = self._cache.make_key(
+            self._model, repr(self._config.temperature), "TopicsWithClaimsResult", prompt
+        )
+        return await self._cache.get_or_compute(
+            key, lambda: self._call_and_parse(prompt, TopicsWithClaimsResult, self._config)
+        )
+
+    async def _call_and_parse[ResultT: BaseModel](
+        self, prompt: str, schema: type[ResultT], config: types.GenerateContentConfig
+    ) -> ResultT:
+        """Call Gemini and parse the response, with retry on transient failures."""
+        return await call_with_retry(
+            self._call_once, prompt, schema, config, batch_mode=self._batch_mode
+        )
+
+    async def _call_once[ResultT: BaseModel](
+        self, prompt: str, schema: type[ResultT], config: types.GenerateContentConfig
+    ) -> ResultT:
+        """Make one attempt at calling Gemini and parsing the response."""
+        if self._batch_mode:
+            # Batch quota is separate from the interactive RPM/TPM budgets
+            response = await generate_content_batch(
+                self._client, self._model, prompt, config, timeout=self._batch_timeout
+            )
+        else:
+            async with throttle(self._rate_limiter, prompt):
+                response = await self._client.aio.models.generate_content(
+                    model=self._model,
+                    contents=prompt,
+                    config=config,
+                )
+
+        # Check finish reason for blocking or truncation
+        if response.candidates:
+            finish_reason = response.candidates[0].finish_reason
+            if finish_reason == types.FinishReason.SAFETY:
+                raise SafetyFilterError()
+            if finish_reason == types.FinishReason.MAX_TOKENS:
+                raise ExtractionError(
+                    "Combined extraction response truncated (output token limit reached)"
+                )
+
+        return parse_structured(response, schema, "combined extraction")
@@ -0,0 +1,162 @@
+"""Client-side Gemini rate limiting.
+
+Admits requests against requests-per-minute and tokens-per-minute budgets,
+and optionally caps how many calls are in flight at once, so bursts queue
+locally instead of triggering 429s that tenacity then has to absorb with
+long backoff waits. Input tokens are estimated from prompt length; a 429
+that reaches us pauses all callers for the server's retry delay.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from contextlib import asynccontextmanager, nullcontext
+from typing import TYPE_CHECKING, Any
+
+from google.genai import errors as genai_errors
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+    from contextlib import AbstractAsyncContextManager
+
+logger = logging.getLogger(__name__)
+
+# Rough English average; good enough for admission control
+_CHARS_PER_TOKEN = 4
+
+# Gemini puts "Please retry in 12.3s." in 429 messages
+_RETRY_IN_PATTERN = re.compile(r"retry in ([\d.]+)\s*s", re.IGNORECASE)
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Estimate input tokens for a prompt (~4 characters per token)."""
+    return len(prompt) // _CHARS_PER_TOKEN + 1
+
+
+def _parse_duration(value: Any) -> float | None:
+    """Parse a protobuf Duration string ("30s", "1.5s") or bare number of seconds."""
+    try:
+        return float(str(value).strip().removesuffix("s"))
+    except ValueError:
+        return None
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Extract the server-requested retry delay from a Gemini API error.
+
+    Checks, in order: a Retry-After response header, the RetryInfo
+    retryDelay in the error details, and "retry in Ns" in the message.
+    Returns None when the error carries no delay.
+    """
+    if not isinstance(exc, genai_errors.APIError):
+        return None
+
+    headers = getattr(exc.response, "headers", None)
+    if headers is not None and headers.get("retry-after") is not None:
+        delay = _parse_duration(headers.get("retry-after"))
+        if delay is not None:
+            return delay
+
+    body = exc.details if isinstance(exc.details, dict) else {}
+    error = body.get("error", body)
+    details = error.get("details", []) if isinstance(error, dict) else []
+    for detail in details:
+        if isinstance(detail, dict) and "retryDelay" in detail:
+            delay = _parse_duration(detail["retryDelay"])
+            if delay is not None:
+                return delay
+
+    match = _RETRY_IN_PATTERN.search(exc.message or "")
+    return float(match.group(1)) if match else None
+
+
+class _TokenBucket:
+    """Per-minute budget refilled continuously."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available (amount is clamped to capacity)."""
+        missing = min(amount, self.capacity) - self.tokens
+        return max(0.0, missing / self._rate)
+
+    def consume(self, amount: float) -> None:
+        self.tokens -= min(amount, self.capacity)
+
+
+class GeminiRateLimiter:
+    """Shared RPM + TPM + concurrency admission control for all Gemini calls."""
+
+    def __init__(
+        self,
+        rpm: int | None = None,
+        tpm: int | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self._buckets: list[tuple[_TokenBucket, bool]] = []
+        if rpm:
+            self._buckets.append((_TokenBucket(rpm), False))
+        if tpm:
+            self._buckets.append((_TokenBucket(tpm), True))
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until one request of the given input token estimate fits both budgets."""
+        # Holding the lock while sleeping queues waiters in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = self._blocked_until - now
+                for bucket, counts_tokens in self._buckets:
+                    bucket.refill(now)
+                    wait = max(wait, bucket.wait_time(tokens if counts_tokens else 1))
+                if wait <= 0:
+                    for bucket, counts_tokens in self._buckets:
+                        bucket.consume(tokens if counts_tokens else 1)
+                    return
+                await asyncio.sleep(wait)
+
+    def penalize(self, seconds: float | None) -> None:
+        """Record a server 429: pause for the retry delay, or drain the budgets."""
+        if seconds is not None:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            return
+        for bucket, _ in self._buckets:
+            bucket.tokens = 0.0
+
+    @asynccontextmanager
+    async def limit(self, prompt: str) -> AsyncIterator[None]:
+        """Admit one Gemini call for prompt and feed any 429 back into the budgets."""
+        # The concurrency slot is held for the whole call, budgets only at admission
+        async with self._slots if self._slots is not None else nullcontext():
+            await self.acquire(estimate_tokens(prompt))
+            try:
+                yield
+            except genai_errors.ClientError as exc:
+                if exc.code == 429:
+                    delay = retry_after_seconds(exc)
+                    logger.warning("Gemini rate limited (retry after %s s)", delay)
+                    self.penalize(delay)
+                raise
+
+
+def throttle(
+    limiter: GeminiRateLimiter | None, prompt: str
+) -> AbstractAsyncContextManager[None]:
+    """Context manager admitting one Gemini call, or a no-op without a limiter."""
+    if limiter is None:
+        return nullcontext()
+    return limiter.limit(prompt)
@@ -8,74 +8,51 @@ and non-deterministic parse failures (malformed JSON from Gemini).
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING
 
-from google.genai import errors as genai_errors
 from google.genai import types
-from json_repair import repair_json
-from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
 from src.config.prompts.topic_extraction import TOPIC_EXTRACTION_PROMPT
 from src.exceptions import ExtractionError, SafetyFilterError
+from src.extraction._config import build_config
+from src.extraction._parse import parse_structured
+from src.extraction._retry import call_with_retry
+from src.extraction.batch import generate_content_batch
+from src.extraction.rate_limiter import throttle
 from src.schemas.llm import TopicResult
 
 if TYPE_CHECKING:
     from google import genai
 
-logger = logging.getLogger(__name__)
-
-
-def _is_retryable(exc: BaseException) -> bool:
-    """Check if an exception is retryable.
+    from src.extraction.rate_limiter import GeminiRateLimiter
+    from src.utils.cache import ResponseCache
 
-    Retries on:
-    - Gemini 429 rate limit or 5xx server errors
-    - ExtractionError (non-deterministic malformed JSON from Gemini)
+logger = logging.getLogger(__name__)
 
-    Does NOT retry SafetyFilterError (content blocked — deterministic).
-    """
-    if isinstance(exc, SafetyFilterError):
-        return False
-    if isinstance(exc, ExtractionError):
-        return True
-    if isinstance(exc, genai_errors.ServerError):
-        return True
-    if isinstance(exc, genai_errors.ClientError):
-        return cast("bool", getattr(exc, "code", 0) == 429)
-    return False
+# Split the template once at import so each request is a single concatenation
+_PROMPT_HEAD, _PROMPT_TAIL = TOPIC_EXTRACTION_PROMPT.format(source_text="\0").split("\0")
 
 
 class TopicExtractor:
     """Extracts discussion topics from source text via Gemini."""
 
     def __init__(
-        self, client: genai.Client, model: str, temperature: float
+        self,
+        client: genai.Client,
+        model: str,
+        temperature: float,
+        cache: ResponseCache | None = None,
+        rate_limiter: GeminiRateLimiter | None = None,
+        batch_mode: bool = False,
+        batch_timeout: float | None = None,
     ) -> None:
         self._client = client
         self._model = model
-        self._config = types.GenerateContentConfig(
-            response_mime_type="application/json",
-            response_schema=TopicResult,
-            temperature=temperature,
-            safety_settings=[
-                types.SafetySetting(
-                    category=types.HarmCategory.HARM_CATEGORY_HATE_SPEECH,
-                    threshold=types.HarmBlockThreshold.BLOCK_NONE,
-                ),
-                types.SafetySetting(
-                    category=types.HarmCategory.HARM_CATEGORY_HARASSMENT,
-                    threshold=types.HarmBlockThreshold.BLOCK_NONE,
-                ),
-                types.SafetySetting(
-                    category=types.HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT,
-                    threshold=types.HarmBlockThreshold.BLOCK_NONE,
-                ),
-                types.SafetySetting(
-                    category=types.HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT,
-                    threshold=types.HarmBlockThreshold.BLOCK_NONE,
-                ),
-            ],
-        )
+        self._cache = cache
+        self._rate_limiter = rate_limiter
+        self._batch_mode = batch_mode
+        self._batch_timeout = batch_timeout
+        self._config = build_config(TopicResult, temperature)
 
     async def extract(self, source_text: str) -> list[str]:
         """Extract topics from source text.
@@ -90,23 +67,37 @@ class TopicExtractor:
             SafetyFilterError: If content is blocked by Gemini safety filters.
             ExtractionError: If response cannot be parsed after retries.
         """
-        prompt = TOPIC_EXTRACTION_PROMPT.format(source_text=source_text)
-        result = await self._call_and_parse(prompt)
+        prompt = "".join((_PROMPT_HEAD, source_text, _PROMPT_TAIL))
+        result = await self._call_cached(prompt)
         return result.topics
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=30),
-        retry=retry_if_exception(_is_retryable),
-        reraise=True,
-    )
+    async def _call_cached(self, prompt: str) -> TopicResult:
+        """Serve identical prompts from the response cache when one is configured."""
+        if self._cache is None:
+            return await self._call_and_parse(prompt)
+        key = self._cache.make_key(
+            self._model, repr(self._config.temperature), "TopicResult", prompt
+        )
+        return await self._cache.get_or_compute(key, lambda: self._call_and_parse(prompt))
+
     async def _call_and_parse(self, prompt: str) -> TopicResult:
         """Call Gemini and parse the response, with retry on transient failures."""
-        response = await self._client.aio.models.generate_content(
-            model=self._model,
-            contents=prompt,
-            config=self._config,
-        )
+        return await call_with_retry(self._call_once, prompt, batch_mode=self._batch_mode)
+
+    async def _call_once(self, prompt: str) -> TopicResult:
+        """Make one attempt at calling Gemini and parsing the response."""
+        if self._batch_mode:
+            # Batch quota is separate from the interactive RPM/TPM budgets
+            response = await generate_content_batch(
+                self._client, self._model, prompt, self._config, timeout=self._batch_timeout
+            )
+        else:
+            async with throttle(self._rate_limiter, prompt):
+                response = await self._client.aio.models.generate_content(
+                    model=self._model,
+                    contents=prompt,
+                    config=self._config,
+                )
 
         # Check finish reason for blocking or truncation
         if response.candidates:
@@ -118,38 +109,4 @@ class TopicExtractor:
                     "Topic extraction response truncated (output token limit reached)"
                 )
 
-        return self._parse_response(response)
-
-    def _parse_response(self, response: Any) -> TopicResult:
-        """Parse Gemini response into TopicResult."""
-        # Try .parsed first (typed structured output)
-        try:
-            parsed: TopicResult | None = cast("TopicResult | None", response.parsed)
-            if parsed is not None:
-                return parsed
-        except Exception:
-            logger.warning("response.parsed access failed, falling back to text")
-
-        # Fall back to manual JSON parsing from response text
-        text: str | None = response.text
-        if text is None:
-            logger.error(
-                "Gemini returned no text; finish_reason=%s",
-                response.candidates[0].finish_reason if response.candidates else "N/A",
-            )
-            raise ExtractionError("Failed to parse topic extraction response: empty text")
-
-        # Try direct parse, then JSON repair fallback
-        try:
-            return TopicResult.model_validate_json(text)
-        except Exception as direct_exc:
-            logger.warning("Direct JSON parse failed, attempting repair: %s", direct_exc)
-
-        try:
-            repaired = repair_json(text)
-            return TopicResult.model_validate_json(repaired)
-        except Exception as exc:
-            logger.error("Topic response parse failed after repair: %s", exc)
-            raise ExtractionError(
-                f"Failed to parse topic extraction response: {exc}"
-            ) from exc
+        return parse_structured(response, TopicResult, "topic extraction")
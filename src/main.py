@@ -14,41 +14,130 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from google import genai
+from google.genai import errors as genai_errors
+from starlette.types import ASGIApp
 
-from src.config.settings import Settings
+from src.config.settings import get_settings
 from src.extraction.claim_extractor import ClaimExtractor
+from src.extraction.combined_extractor import CombinedExtractor
+from src.extraction.rate_limiter import GeminiRateLimiter
 from src.extraction.topic_extractor import TopicExtractor
 from src.routers.generate import router as generate_router
 from src.routers.health import router as health_router
 from src.services.claim_generation import ClaimGenerationService
+from src.services.micro_batcher import MicroBatcher
+from src.utils.cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parent
 
 
+class SettingsCORSMiddleware(CORSMiddleware):
+    """CORS configured from settings when the middleware stack is built.
+
+    Starlette builds the stack on the app's first ASGI call (server start),
+    so CORS_ORIGINS is read then, like the rest of the settings in lifespan,
+    rather than when this module is imported.
+
+    The bundled UI is same-origin, so the allowlist defaults to empty. No
+    cookies or auth headers are used: credentials stay off, letting a "*"
+    allowlist send a static header instead of echoing each request's Origin.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        super().__init__(
+            app,
+            allow_origins=get_settings().cors_origins,
+            allow_credentials=False,
+            allow_methods=["GET", "POST"],
+            allow_headers=["Content-Type", "Authorization"],
+        )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Application lifespan: validate config and initialize services."""
-    settings = Settings()
+    settings = get_settings()
     logging.basicConfig(level=settings.log_level)
     logger.info("Starting Claim API on port %d", settings.port)
     logger.info("Gemini model: %s", settings.gemini_model)
+    logger.info(
+        "Extraction mode: %s", "combined" if settings.combined_extraction else "two-step"
+    )
 
     app.state.settings = settings
+    micro_batcher: MicroBatcher | None = None
 
     if settings.gemini_api_key:
         client = genai.Client(api_key=settings.gemini_api_key)
         app.state.gemini_client = client
 
+        # One cache shared by all extractors (keys include the response schema)
+        cache = (
+            ResponseCache(
+                settings.response_cache_max_size, settings.response_cache_ttl_seconds
+            )
+            if settings.response_cache_enabled
+            else None
+        )
+        # One limiter shared by all extractors so budgets cover every Gemini call
+        rate_limiter = (
+            GeminiRateLimiter(
+                settings.gemini_rpm, settings.gemini_tpm, settings.gemini_max_concurrency
+            )
+            if settings.gemini_rpm or settings.gemini_tpm or settings.gemini_max_concurrency
+            else None
+        )
         topic_extractor = TopicExtractor(
-            client, settings.gemini_model, settings.gemini_temperature
+            client,
+            settings.gemini_model,
+            settings.gemini_temperature,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            batch_mode=settings.batch_mode,
+            batch_timeout=settings.batch_timeout_seconds,
         )
         claim_extractor = ClaimExtractor(
-            client, settings.gemini_model, settings.gemini_temperature
+            client,
+            settings.gemini_model,
+            settings.gemini_temperature,
+            fanout_concurrency=settings.claim_fanout_concurrency,
+            cache=cache,
+            rate_limiter=rate_limiter,
+            batch_mode=settings.batch_mode,
+            batch_timeout=settings.batch_timeout_seconds,
         )
+        combined_extractor = (
+            CombinedExtractor(
+                client,
+                settings.gemini_model,
+                settings.gemini_temperature,
+                cache=cache,
+                rate_limiter=rate_limiter,
+                batch_mode=settings.batch_mode,
+                batch_timeout=settings.batch_timeout_seconds,
+            )
+            if settings.combined_extraction
+            else None
+        )
+        if combined_extractor is not None and settings.micro_batch_window_ms > 0:
+            micro_batcher = MicroBatcher(
+                combined_extractor.extract,
+                combined_extractor.extract_many,
+                settings.micro_batch_window_ms / 1000,
+                settings.micro_batch_max_size,
+            )
+            micro_batcher.start()
         app.state.claim_generation_service = ClaimGenerationService(
-            topic_extractor, claim_extractor
+            topic_extractor,
+            claim_extractor,
+            combined_extractor,
+            min_words_for_topics=settings.min_words_for_topics,
+            claim_chunk_chars=settings.claim_chunk_chars,
+            micro_batcher=micro_batcher,
+            # Batch jobs return everything at once, so there is nothing to stream
+            streaming_enabled=not settings.batch_mode,
         )
     else:
         logger.warning(
@@ -59,6 +148,8 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     yield
 
     logger.info("Shutting down Claim API")
+    if micro_batcher is not None:
+        await micro_batcher.close()
 
 
 app = FastAPI(
@@ -70,28 +161,26 @@ app = FastAPI(
 app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
 templates = Jinja2Templates(directory=BASE_DIR / "templates")
 
+# The page has no per-request variables, so it is rendered once at import
+_INDEX_HTML = templates.get_template("index.html").render().encode()
+
 
 @app.get("/", response_class=HTMLResponse)
-async def index(request: Request) -> HTMLResponse:
+async def index() -> HTMLResponse:
     """Serve the Claim Extractor web UI."""
-    return templates.TemplateResponse(request=request, name="index.html")
+    return HTMLResponse(_INDEX_HTML)
 
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(SettingsCORSMiddleware)
 
 
-@app.exception_handler(Exception)
-async def generic_exception_handler(request: Request, exc: Exception) -> JSONResponse:
-    """Handle unexpected exceptions with a safe error response."""
+@app.exception_handler(genai_errors.APIError)
+async def gemini_error_handler(request: Request, exc: genai_errors.APIError) -> JSONResponse:
+    """Report Gemini API errors that were not retried (or outlasted retries) as 502."""
+    logger.error("Gemini API error: %s", exc)
     return JSONResponse(
-        status_code=500,
-        content={"detail": "An unexpected error occurred"},
+        status_code=502,
+        content={"detail": f"LLM provider error: {exc.code} {exc.status}"},
     )
 
 
@@ -1,18 +1,25 @@
-"""Claim generation endpoint.
+"""Claim generation endpoints.
 
 POST /generate/claims accepts source text and returns extracted claims
-organized by topic. Delegates to ClaimGenerationService via dependency
-injection. Exceptions propagate as HTTP errors automatically.
+organized by topic. POST /generate/claims/stream returns the same claims
+as NDJSON, one line per claim, as soon as each topic is extracted.
+Delegates to the ClaimGenerationService stored on app.state. Exceptions
+propagate as HTTP errors automatically.
 """
 
-from typing import Annotated
+import logging
+from collections.abc import AsyncIterator
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from google.genai import errors as genai_errors
 
 from src.dependencies import get_claim_generation_service
-from src.schemas.requests import ClaimGenerationRequest
-from src.schemas.responses import ClaimGenerationResponse, ErrorResponse
-from src.services.claim_generation import ClaimGenerationService
+from src.exceptions import ExtractionError
+from src.schemas.requests import SourceText
+from src.schemas.responses import ClaimGenerationResponse, ClaimResponse, ErrorResponse
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["generate"])
 
@@ -26,12 +33,59 @@ router = APIRouter(tags=["generate"])
     },
 )
 async def generate_claims(
-    body: ClaimGenerationRequest,
-    service: Annotated[ClaimGenerationService, Depends(get_claim_generation_service)],
+    source_text: SourceText,
+    request: Request,
 ) -> ClaimGenerationResponse:
     """Extract topic-organized claims from source text.
 
     Accepts raw text and returns a flat list of claim-topic pairs.
     Validation errors return 422, extraction failures return 502.
     """
-    return await service.generate_claims(body.source_text)
+    service = get_claim_generation_service(request)
+    return await service.generate_claims(source_text)
+
+
+@router.post(
+    "/generate/claims/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}},
+        422: {"model": ErrorResponse},
+        501: {"model": ErrorResponse},
+        502: {"model": ErrorResponse},
+    },
+)
+async def stream_claims(
+    source_text: SourceText,
+    request: Request,
+) -> StreamingResponse:
+    """Stream topic-organized claims from source text as NDJSON.
+
+    Each line is one claim-topic pair. Failures before the first claim
+    return 422/502 like POST /generate/claims; a failure after that ends
+    the stream with a final {"detail": ...} line, e.g. when Gemini's output
+    is truncated after some topics were sent. Returns 501 in batch mode.
+    """
+    claims = get_claim_generation_service(request).stream_claims(source_text)
+    # Wait for the first claim so early failures keep their HTTP status; an
+    # empty extraction raises EmptyExtractionError from the service itself
+    first = await anext(claims)
+    return StreamingResponse(_ndjson_lines(first, claims), media_type="application/x-ndjson")
+
+
+async def _ndjson_lines(
+    first: ClaimResponse, rest: AsyncIterator[ClaimResponse]
+) -> AsyncIterator[str]:
+    """Serialize claims one per line, reporting a mid-stream failure in-band."""
+    yield first.model_dump_json() + "\n"
+    try:
+        async for claim in rest:
+            yield claim.model_dump_json() + "\n"
+    except ExtractionError as exc:
+        # Headers are already sent, so the status code can no longer change
+        logger.error("Claim stream failed: %s", exc.detail)
+        yield ErrorResponse(detail=exc.detail).model_dump_json() + "\n"
+    except genai_errors.APIError as exc:
+        logger.error("Claim stream failed: %s", exc)
+        detail = f"LLM provider error: {exc.code} {exc.status}"
+        yield ErrorResponse(detail=detail).model_dump_json() + "\n"
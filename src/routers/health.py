@@ -1,11 +1,18 @@
 """Health check endpoint."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 router = APIRouter(tags=["health"])
 
+# Probed every few seconds: send prebuilt bytes, skipping model and JSON encoding
+_HEALTH_BODY = b'{"status":"ok"}'
 
-@router.get("/health")
-async def health_check() -> dict[str, str]:
+
+@router.get(
+    "/health",
+    response_class=Response,
+    responses={200: {"content": {"application/json": {"example": {"status": "ok"}}}}},
+)
+async def health_check() -> Response:
     """Return service health status. No external dependencies."""
-    return {"status": "ok"}
+    return Response(content=_HEALTH_BODY, media_type="application/json")
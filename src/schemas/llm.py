@@ -36,3 +36,34 @@ class ClaimWithTopicResult(BaseModel):
     claim_topics: list[ClaimWithTopicBaseResult] = Field(
         description="Claims organized by topic."
     )
+
+
+class TopicsWithClaimsResult(BaseModel):
+    """Gemini response schema for fused topic + claim extraction (single step)."""
+
+    topics: list[ClaimWithTopicBaseResult] = Field(
+        description=(
+            "Topics in order of appearance in the source text, "
+            "each with the claims organized under it."
+        )
+    )
+
+
+class DocumentTopicsResult(BaseModel):
+    """Topics with their claims for one document of a multi-document call."""
+
+    document: int = Field(description="Index N of the document's <<<DOC N>>> marker")
+    topics: list[ClaimWithTopicBaseResult] = Field(
+        description=(
+            "Topics in order of appearance in this document, "
+            "each with the claims organized under it."
+        )
+    )
+
+
+class DocumentsWithClaimsResult(BaseModel):
+    """Gemini response schema for fused extraction over several documents."""
+
+    documents: list[DocumentTopicsResult] = Field(
+        description="One entry per source document."
+    )
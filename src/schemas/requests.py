@@ -1,14 +1,17 @@
-"""API request models."""
+"""API request parameters."""
 
-from pydantic import BaseModel, Field
+from typing import Annotated
 
+from fastapi import Body
 
-class ClaimGenerationRequest(BaseModel):
-    """Request body for claim generation endpoint."""
-
-    source_text: str = Field(
-        ...,
+# Embedded body field: clients still send {"source_text": "..."}, but FastAPI
+# checks the length directly instead of instantiating a request model first
+SourceText = Annotated[
+    str,
+    Body(
+        embed=True,
         min_length=50,
         max_length=50000,
         description="Source text to extract claims from (50-50,000 characters)",
-    )
+    ),
+]
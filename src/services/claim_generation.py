@@ -1,26 +1,42 @@
 """Claim generation orchestration service.
 
-Coordinates the two-step extraction pipeline: topic extraction then claim extraction.
+Runs the fused single-call extraction when a CombinedExtractor is configured,
+otherwise the two-step pipeline: topic extraction then claim extraction.
 Transforms LLM output shape into the API response shape.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import sys
+from contextlib import aclosing
 from typing import TYPE_CHECKING
 
 from tenacity import RetryError
 
-from src.exceptions import EmptyExtractionError, LLMProviderError
+from src.exceptions import (
+    EmptyExtractionError,
+    LLMProviderError,
+    StreamingUnavailableError,
+)
+from src.schemas.llm import ClaimWithTopicBaseResult
 from src.schemas.responses import ClaimGenerationResponse, ClaimResponse
-from src.utils.text import sanitize_source_text
+from src.utils.text import sanitize_source_text, split_into_chunks
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, AsyncIterator
+
     from src.extraction.claim_extractor import ClaimExtractor
+    from src.extraction.combined_extractor import CombinedExtractor
     from src.extraction.topic_extractor import TopicExtractor
+    from src.services.micro_batcher import MicroBatcher
 
 logger = logging.getLogger(__name__)
 
+# Topic label used when short inputs skip topic extraction
+SINGLE_TOPIC_LABEL = "Main topic"
+
 
 class ClaimGenerationService:
     """Orchestrates topic extraction -> claim extraction pipeline."""
@@ -29,9 +45,19 @@ class ClaimGenerationService:
         self,
         topic_extractor: TopicExtractor,
         claim_extractor: ClaimExtractor,
+        combined_extractor: CombinedExtractor | None = None,
+        min_words_for_topics: int = 0,
+        claim_chunk_chars: int = 0,
+        micro_batcher: MicroBatcher | None = None,
+        streaming_enabled: bool = True,
     ) -> None:
         self._topic_extractor = topic_extractor
         self._claim_extractor = claim_extractor
+        self._combined_extractor = combined_extractor
+        self._min_words_for_topics = min_words_for_topics
+        self._claim_chunk_chars = claim_chunk_chars
+        self._micro_batcher = micro_batcher
+        self._streaming_enabled = streaming_enabled
 
     async def generate_claims(self, source_text: str) -> ClaimGenerationResponse:
         """Run the full extraction pipeline on source text.
@@ -50,38 +76,186 @@ class ClaimGenerationService:
         """
         try:
             # Normalize Unicode that triggers Gemini JSON escaping bugs
+            original_length = len(source_text)
             source_text = sanitize_source_text(source_text)
+            logger.debug(
+                "Sanitized source text: %d -> %d chars", original_length, len(source_text)
+            )
 
-            # Step 1: Extract topics
-            topics = await self._topic_extractor.extract(source_text)
-            if not topics:
-                raise EmptyExtractionError(
-                    "No topics could be extracted from the source text"
-                )
-            logger.info("Extracted %d topics", len(topics))
+            if self._combined_extractor is not None:
+                # Single call: topics and their claims together, coalesced with
+                # concurrent requests when a micro-batcher is configured
+                if self._micro_batcher is not None:
+                    claims_by_topic = await self._micro_batcher.submit(source_text)
+                else:
+                    claims_by_topic = await self._combined_extractor.extract(source_text)
+                if any(item.claims for item in claims_by_topic):
+                    logger.info("Extracted %d topics", len(claims_by_topic))
+                else:
+                    # The fused prompt occasionally comes back empty on text the
+                    # dedicated topic prompt handles; retry it the two-step way
+                    logger.warning("Combined extraction found no claims, using two-step")
+                    claims_by_topic = await self._extract_two_step(source_text)
+            else:
+                claims_by_topic = await self._extract_two_step(source_text)
 
-            # Step 2: Extract claims organized by topics
-            claims_by_topic = await self._claim_extractor.extract(
-                source_text, topics
+            # Transform LLM output shape to API response shape. Topics and claims
+            # were validated as str by the Gemini schema, so skip re-validation.
+            # Interning makes a topic Gemini repeats across items one shared str;
+            # repeated topic-claim pairs keep their first occurrence only
+            pairs = dict.fromkeys(
+                (sys.intern(item.topic), claim_text)
+                for item in claims_by_topic
+                for claim_text in item.claims
             )
-
-            # Transform LLM output shape to API response shape
-            claims: list[ClaimResponse] = []
-            for item in claims_by_topic:
-                for claim_text in item.claims:
-                    claims.append(
-                        ClaimResponse(claim_topic=item.topic, claim=claim_text)
-                    )
+            construct = ClaimResponse.model_construct
+            claims = [construct(claim_topic=topic, claim=claim) for topic, claim in pairs]
 
             if not claims:
                 raise EmptyExtractionError(
                     "No claims could be extracted from the source text"
                 )
 
-            logger.info("Extracted %d total claims across %d topics", len(claims), len(topics))
-            return ClaimGenerationResponse(claims=claims)
+            logger.info(
+                "Extracted %d total claims across %d topics",
+                len(claims),
+                len(claims_by_topic),
+            )
+            return ClaimGenerationResponse.model_construct(claims=claims)
+
+        except RetryError as exc:
+            original = exc.last_attempt.exception() if exc.last_attempt else None
+            detail = f"LLM provider error after retries exhausted: {original}"
+            raise LLMProviderError(detail=detail) from exc
+
+    async def stream_claims(self, source_text: str) -> AsyncIterator[ClaimResponse]:
+        """Yield claims as soon as each topic's claims have been extracted.
+
+        Runs the same pipeline as generate_claims (combined, two-step,
+        chunking and per-topic fan-out) except the micro-batcher: a batched
+        call returns every document at once, so combined extraction streams
+        its own call instead.
+
+        Args:
+            source_text: Raw text to extract claims from.
+
+        Yields:
+            ClaimResponse per claim; duplicate topic-claim pairs are skipped.
 
+        Raises:
+            EmptyExtractionError: If no topics or no claims could be extracted.
+            LLMProviderError: If Gemini calls fail after all retries exhausted.
+            SafetyFilterError: If content is blocked by safety filters.
+            ExtractionError: If response parsing fails.
+            StreamingUnavailableError: If streaming is disabled (batch mode).
+        """
+        if not self._streaming_enabled:
+            raise StreamingUnavailableError()
+        source_text = sanitize_source_text(source_text)
+        construct = ClaimResponse.model_construct
+        seen: set[tuple[str, str]] = set()
+        try:
+            # aclosing runs the pipeline's cleanup as soon as this stream is closed
+            async with aclosing(self._stream_topics(source_text)) as items:
+                async for item in items:
+                    topic = sys.intern(item.topic)
+                    for claim_text in item.claims:
+                        if (topic, claim_text) in seen:
+                            continue
+                        seen.add((topic, claim_text))
+                        yield construct(claim_topic=topic, claim=claim_text)
         except RetryError as exc:
             original = exc.last_attempt.exception() if exc.last_attempt else None
             detail = f"LLM provider error after retries exhausted: {original}"
             raise LLMProviderError(detail=detail) from exc
+
+        if not seen:
+            raise EmptyExtractionError("No claims could be extracted from the source text")
+        logger.info("Streamed %d claims", len(seen))
+
+    async def _stream_topics(
+        self, source_text: str
+    ) -> AsyncGenerator[ClaimWithTopicBaseResult, None]:
+        """Yield topics with their claims from whichever pipeline is configured."""
+        if self._combined_extractor is not None:
+            found_claims = False
+            async for item in self._combined_extractor.extract_stream(source_text):
+                found_claims = found_claims or bool(item.claims)
+                yield item
+            if found_claims:
+                return
+            # Same fallback as generate_claims, so both endpoints agree on empty input
+            logger.warning("Combined extraction found no claims, using two-step")
+
+        if len(source_text.split()) < self._min_words_for_topics:
+            topics = [SINGLE_TOPIC_LABEL]
+        else:
+            topics = await self._topic_extractor.extract(source_text)
+            if not topics:
+                raise EmptyExtractionError("No topics could be extracted from the source text")
+            logger.info("Extracted %d topics", len(topics))
+
+        if not 0 < self._claim_chunk_chars < len(source_text):
+            async for item in self._claim_extractor.extract_stream(source_text, topics):
+                yield item
+            return
+
+        # Chunked: emit each chunk's claims as soon as its call finishes
+        tasks = [
+            asyncio.ensure_future(self._claim_extractor.extract(chunk, topics))
+            for chunk in split_into_chunks(source_text, self._claim_chunk_chars)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for item in await next_done:
+                    yield item
+        finally:
+            # Await the cancelled tasks so none outlives the stream unobserved
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _extract_two_step(self, source_text: str) -> list[ClaimWithTopicBaseResult]:
+        """Extract topics first, then claims organized by those topics."""
+        # Short inputs hold at most one topic: skip the topic extraction call
+        if len(source_text.split()) < self._min_words_for_topics:
+            logger.info("Short input, skipping topic extraction")
+            return await self._claim_extractor.extract(source_text, [SINGLE_TOPIC_LABEL])
+
+        # Step 1: Extract topics
+        topics = await self._topic_extractor.extract(source_text)
+        if not topics:
+            raise EmptyExtractionError("No topics could be extracted from the source text")
+        logger.info("Extracted %d topics", len(topics))
+
+        # Step 2: Extract claims organized by topics
+        if 0 < self._claim_chunk_chars < len(source_text):
+            return await self._extract_chunked(source_text, topics, self._claim_chunk_chars)
+        return await self._claim_extractor.extract(source_text, topics)
+
+    async def _extract_chunked(
+        self, source_text: str, topics: list[str], max_chars: int
+    ) -> list[ClaimWithTopicBaseResult]:
+        """Extract claims from paragraph chunks concurrently and merge them by topic."""
+        chunks = split_into_chunks(source_text, max_chars)
+        logger.info("Extracting claims from %d chunks concurrently", len(chunks))
+        results = await asyncio.gather(
+            *(self._claim_extractor.extract(chunk, topics) for chunk in chunks)
+        )
+
+        # Requested topics first, in order; any topic Gemini added goes after them
+        merged: dict[str, list[str]] = {topic: [] for topic in topics}
+        seen: dict[str, set[str]] = {topic: set() for topic in topics}
+        for chunk_result in results:
+            for item in chunk_result:
+                topic_claims = merged.setdefault(item.topic, [])
+                topic_seen = seen.setdefault(item.topic, set())
+                for claim in item.claims:
+                    if claim not in topic_seen:
+                        topic_seen.add(claim)
+                        topic_claims.append(claim)
+        return [
+            ClaimWithTopicBaseResult(topic=topic, claims=claims)
+            for topic, claims in merged.items()
+            if claims
+        ]
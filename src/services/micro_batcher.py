@@ -0,0 +1,162 @@
+"""Request micro-batching for combined extraction.
+
+Requests arriving within a short window are coalesced (up to a maximum
+batch size) into one multi-document Gemini call, trading a few
+milliseconds of queueing for fewer calls under concurrent load.
+
+Texts from unrelated requests share one prompt, so a model slip or a
+prompt injection in one text could place its content in another caller's
+result. Each batched result is checked against its own document and a
+batch that fails the check is re-run one document at a time; even so,
+batching is meant for single-tenant deployments.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import re
+from typing import TYPE_CHECKING
+
+from src.exceptions import LLMProviderError
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+    from src.schemas.llm import ClaimWithTopicBaseResult
+
+logger = logging.getLogger(__name__)
+
+type _Result = list[ClaimWithTopicBaseResult]
+
+_WORD = re.compile(r"\w{4,}")
+
+
+def _words(text: str) -> set[str]:
+    """Case-folded words of four or more characters in text."""
+    return {word.casefold() for word in _WORD.findall(text)}
+
+
+def _crosses_documents(texts: list[str], results: list[_Result]) -> bool:
+    """Whether any topic or claim shares more words with another document than its own."""
+    vocabularies = [_words(text) for text in texts]
+    for index, topics in enumerate(results):
+        own = vocabularies[index]
+        others = [vocab for other, vocab in enumerate(vocabularies) if other != index]
+        for item in topics:
+            for statement in (item.topic, *item.claims):
+                words = _words(statement)
+                grounded = len(words & own)
+                if any(len(words & vocab) > grounded for vocab in others):
+                    return True
+    return False
+
+
+class MicroBatcher:
+    """Coalesces concurrent extraction requests into batched calls."""
+
+    def __init__(
+        self,
+        extract_one: Callable[[str], Awaitable[_Result]],
+        extract_many: Callable[[list[str]], Awaitable[list[_Result]]],
+        window_seconds: float,
+        max_size: int,
+    ) -> None:
+        self._extract_one = extract_one
+        self._extract_many = extract_many
+        self._window_seconds = window_seconds
+        self._max_size = max_size
+        self._queue: asyncio.Queue[tuple[str, asyncio.Future[_Result]]] = asyncio.Queue()
+        self._worker: asyncio.Task[None] | None = None
+        # Strong references keep in-flight batches from being garbage collected
+        self._in_flight: set[asyncio.Task[None]] = set()
+        # Every caller still waiting, queued or in flight, so close() can resolve them
+        self._pending: set[asyncio.Future[_Result]] = set()
+
+    def start(self) -> None:
+        """Start the background task that collects batches."""
+        self._worker = asyncio.create_task(self._collect())
+
+    async def close(self) -> None:
+        """Stop collecting and cancel batches still in flight.
+
+        Callers still waiting, whether queued or in flight, fail with
+        LLMProviderError rather than hanging on a future nobody resolves.
+        """
+        for future in list(self._pending):
+            if not future.done():
+                future.set_exception(LLMProviderError("Extraction cancelled: shutting down"))
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        tasks = [*self._in_flight, *([self._worker] if self._worker else [])]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def submit(self, source_text: str) -> _Result:
+        """Queue one source text and wait for its extraction result."""
+        future: asyncio.Future[_Result] = asyncio.get_running_loop().create_future()
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        await self._queue.put((source_text, future))
+        return await future
+
+    async def _collect(self) -> None:
+        """Group queued requests by window and size, dispatching each batch."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._window_seconds
+            while len(batch) < self._max_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except TimeoutError:
+                    break
+            # Dispatch without waiting so slow Gemini calls don't delay the next window
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: list[tuple[str, asyncio.Future[_Result]]]) -> None:
+        """Run one batch and resolve each caller's future."""
+        texts = [text for text, _ in batch]
+        if len(batch) > 1:
+            try:
+                results = await self._extract_many(texts)
+            except Exception as exc:
+                # One blocked or unparseable document must not fail its neighbours
+                logger.warning("Batch of %d failed, retrying one by one: %s", len(batch), exc)
+            else:
+                if _crosses_documents(texts, results):
+                    logger.warning(
+                        "Batch of %d returned content matching another document, "
+                        "retrying one by one",
+                        len(batch),
+                    )
+                else:
+                    logger.info("Extracted a batch of %d documents in one call", len(batch))
+                    for (_, future), result in zip(batch, results, strict=True):
+                        if not future.done():
+                            future.set_result(result)
+                    return
+
+        await asyncio.gather(
+            *(self._resolve_one(text, future) for text, future in batch)
+        )
+
+    async def _resolve_one(self, text: str, future: asyncio.Future[_Result]) -> None:
+        """Extract one document on its own and resolve its future."""
+        try:
+            result = await self._extract_one(text)
+        except Exception as exc:
+            if not future.done():
+                future.set_exception(exc)
+        else:
+            if not future.done():
+                future.set_result(result)
@@ -0,0 +1,89 @@
+"""In-process TTL/LRU cache for parsed Gemini responses.
+
+Identical extraction requests (client retries, duplicate submissions)
+are served from memory instead of re-calling Gemini. Deliberate
+regenerations get the cached result too, so the cache is opt-in.
+Concurrent misses for the same key share a single computation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, TypeVar, cast
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+T = TypeVar("T")
+
+
+class ResponseCache:
+    """Bounded LRU cache with per-entry expiry, keyed by a content hash."""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600.0) -> None:
+        self._max_size = max_size
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        # Per-key lock plus the number of callers holding or queued on it
+        self._locks: dict[str, tuple[asyncio.Lock, int]] = {}
+
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Hash key parts (model, temperature, schema, prompt) into a fixed-size key."""
+        digest = hashlib.blake2b(digest_size=32)
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Return the cached value for key, computing and storing it on a miss.
+
+        Failures are not cached. Concurrent callers for the same key wait on
+        one computation instead of each calling Gemini.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cast("T", cached)
+
+        lock, users = self._locks.get(key, (asyncio.Lock(), 0))
+        self._locks[key] = (lock, users + 1)
+        try:
+            async with lock:
+                cached = self.get(key)
+                if cached is not None:
+                    return cast("T", cached)
+                value = await compute()
+                self.set(key, value)
+                return value
+        finally:
+            # A released lock may still have queued waiters, so count them instead
+            lock, users = self._locks[key]
+            if users == 1:
+                del self._locks[key]
+            else:
+                self._locks[key] = (lock, users - 1)
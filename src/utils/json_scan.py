@@ -0,0 +1,123 @@
+"""Cheap recovery of JSON embedded in LLM output.
+
+Gemini occasionally wraps otherwise valid JSON in code fences or prose,
+or stops mid-value. A single pass that tracks bracket depth (respecting
+strings and escapes) recovers wrapped JSON, and pydantic-core's partial
+mode recovers truncated JSON, before falling back to the much slower
+json_repair.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pydantic_core import from_json
+
+_OPENERS = "{["
+_CLOSERS = "}]"
+
+
+def extract_outermost_json(text: str) -> str | None:
+    """Return the first balanced JSON object or array in text.
+
+    Scans from the first '{' or '[' and returns the substring ending where
+    bracket depth returns to zero. Brackets inside string literals are
+    ignored. Returns None if there is no opening bracket or the value is
+    never closed (e.g. truncated output).
+    """
+    start = -1
+    for i, char in enumerate(text):
+        if char in _OPENERS:
+            start = i
+            break
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _OPENERS:
+            depth += 1
+        elif char in _CLOSERS:
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+    return None
+
+
+def parse_partial_json(text: str) -> Any | None:
+    """Parse a JSON value that may be cut off partway through.
+
+    Parsing starts at the first '{' or '['. Open containers are closed and
+    an unterminated trailing string is dropped. Returns None if there is no
+    opening bracket or the text is malformed rather than merely truncated.
+    """
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return None
+    try:
+        return from_json(text[min(starts) :], allow_partial=True)
+    except ValueError:
+        return None
+
+
+class ArrayItemScanner:
+    """Incrementally extracts objects from the array inside a top-level JSON object.
+
+    Feed streamed text chunks in order; each call returns the JSON text of
+    every array element object completed so far, e.g. each topic of
+    {"topics": [{...}, {...}]} as soon as its closing brace arrives.
+    Only the text of a still-open element is kept between calls.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._item_start = -1
+
+    def feed(self, chunk: str) -> list[str]:
+        """Consume the next chunk and return newly completed item JSON strings."""
+        self._text += chunk
+        items: list[str] = []
+        for i in range(self._pos, len(self._text)):
+            char = self._text[i]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in _OPENERS:
+                self._depth += 1
+                # Depth 1 is the outer object, 2 the array, 3 an array element
+                if self._depth == 3 and char == "{":
+                    self._item_start = i
+            elif char in _CLOSERS:
+                if self._depth == 3 and self._item_start != -1:
+                    items.append(self._text[self._item_start : i + 1])
+                    self._item_start = -1
+                self._depth -= 1
+        # Drop consumed text so each feed copies at most the open element
+        cut = len(self._text) if self._item_start == -1 else self._item_start
+        self._text = self._text[cut:]
+        if self._item_start != -1:
+            self._item_start = 0
+        self._pos = len(self._text)
+        return items
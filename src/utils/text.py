@@ -1,7 +1,8 @@
 """Text sanitization for LLM input.
 
 Normalizes Unicode characters that trigger escape sequence bugs
-in Gemini structured JSON output.
+in Gemini structured JSON output, and compacts whitespace so the
+prompt carries fewer input tokens.
 """
 
 from __future__ import annotations
@@ -33,11 +34,29 @@ _MISC_MAP: dict[str, str] = {
 }
 
 _CHAR_MAP: dict[str, str] = {**_QUOTE_MAP, **_DASH_MAP, **_MISC_MAP}
-_CHAR_PATTERN = re.compile("|".join(re.escape(c) for c in _CHAR_MAP))
+
+# One C-level pass: character map plus lone \r → \n (\r\n is handled first)
+_TRANS_TABLE = str.maketrans({**_CHAR_MAP, "\r": "\n"})
+
+# Runs of spaces/tabs → single space; spaces hugging a newline → dropped
+_HORIZONTAL_WHITESPACE = re.compile(r"[ \t\f\v]+")
+_SPACE_AROUND_NEWLINE = re.compile(r" ?\n ?")
 
 # 3+ consecutive newlines → double newline
 _EXCESSIVE_NEWLINES = re.compile(r"\n{3,}")
 
+# ASCII text containing none of these is already in sanitized form
+_DIRTY_SUBSTRINGS = ("\r", "\n\n\n", "  ", "\t", "\f", "\v", " \n", "\n ")
+
+
+def _is_clean(text: str) -> bool:
+    """Check whether sanitize_source_text would return text unchanged."""
+    return (
+        text.isascii()
+        and not any(dirty in text for dirty in _DIRTY_SUBSTRINGS)
+        and not (text[:1].isspace() or text[-1:].isspace())
+    )
+
 
 def sanitize_source_text(text: str) -> str:
     """Normalize Unicode characters that cause Gemini JSON escaping bugs.
@@ -47,15 +66,46 @@ def sanitize_source_text(text: str) -> str:
         - Em/en dashes → ASCII dashes
         - Ellipsis, NBSP → ASCII equivalents
         - \\r\\n → \\n
+        - Collapse runs of spaces/tabs to one space, trim spaces at line edges
         - Collapse 3+ consecutive newlines to \\n\\n
+        - Strip leading/trailing whitespace
+
+    Newlines are kept: paragraph breaks help Gemini find topic boundaries.
     """
-    # Normalize line endings
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    # Programmatic clients mostly send clean ASCII: a few C-level scans
+    # are cheaper than the translate and regex passes below
+    if _is_clean(text):
+        return text
 
-    # Replace problematic Unicode characters
-    text = _CHAR_PATTERN.sub(lambda m: _CHAR_MAP[m.group()], text)
+    # Normalize line endings and replace problematic Unicode characters
+    text = text.replace("\r\n", "\n").translate(_TRANS_TABLE)
 
-    # Collapse excessive newlines
-    text = _EXCESSIVE_NEWLINES.sub("\n\n", text)
+    # Compact horizontal whitespace (after NBSP became a plain space)
+    text = _HORIZONTAL_WHITESPACE.sub(" ", text)
+    text = _SPACE_AROUND_NEWLINE.sub("\n", text)
 
-    return text
+    # Collapse excessive newlines (substring check skips the regex on clean text)
+    if "\n\n\n" in text:
+        text = _EXCESSIVE_NEWLINES.sub("\n\n", text)
+
+    return text.strip()
+
+
+def split_into_chunks(text: str, max_chars: int) -> list[str]:
+    """Split text on paragraph breaks into chunks of at most max_chars.
+
+    Paragraphs are packed greedily in order; a single paragraph longer than
+    max_chars becomes its own chunk rather than being cut mid-sentence.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for paragraph in text.split("\n\n"):
+        if current and size + len(paragraph) > max_chars:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(paragraph)
+        size += len(paragraph) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
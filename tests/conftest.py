@@ -6,24 +6,34 @@ All tests mock Gemini -- NO real API calls.
 
 from __future__ import annotations
 
-import os
+from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING, Any
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from fastapi.testclient import TestClient
 
-from src.dependencies import get_claim_generation_service
+from src.config.settings import get_settings
 from src.main import app
 from src.schemas.llm import ClaimWithTopicBaseResult, ClaimWithTopicResult, TopicResult
 from src.schemas.responses import ClaimGenerationResponse, ClaimResponse
 from src.services.claim_generation import ClaimGenerationService
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import AsyncIterator, Generator
 
+    from fastapi import FastAPI
 
-@pytest.fixture()
+
+@pytest.fixture(autouse=True)
+def fresh_settings() -> Generator[None, None, None]:
+    """Reload settings per test so monkeypatched env vars take effect."""
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
+
+
+@pytest.fixture(scope="session")
 def sample_source_text() -> str:
     """A realistic 200-word news article snippet about renewable energy."""
     return (
@@ -47,7 +57,7 @@ def sample_source_text() -> str:
     )
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def sample_short_text() -> str:
     """A string below the minimum length threshold."""
     return "Too short to extract claims."
@@ -89,9 +99,13 @@ def sample_claims_result() -> ClaimWithTopicResult:
     )
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def mock_gemini_response() -> Any:
-    """Factory fixture creating a mock Gemini response."""
+    """Factory fixture creating a mock Gemini response.
+
+    The factory holds no state, so it is built once per session; every
+    call returns a fresh mock that tests may modify freely.
+    """
 
     def _create(
         parsed: Any = None,
@@ -105,19 +119,38 @@ def mock_gemini_response() -> Any:
         candidate = MagicMock()
         candidate.finish_reason = finish_reason
         response.candidates = [candidate]
-
         return response
 
     return _create
 
 
+@pytest.fixture(scope="session")
+def mock_gemini_stream() -> Any:
+    """Factory fixture creating a mock Gemini response stream from text chunks."""
+
+    def _create(*texts: str, finish_reason: str = "STOP") -> AsyncIterator[MagicMock]:
+        async def _stream() -> AsyncIterator[MagicMock]:
+            for index, text in enumerate(texts):
+                chunk = MagicMock()
+                chunk.text = text
+                candidate = MagicMock()
+                candidate.finish_reason = finish_reason if index == len(texts) - 1 else None
+                chunk.candidates = [candidate]
+                yield chunk
+
+        return _stream()
+
+    return _create
+
+
 @pytest.fixture()
 def mock_genai_client() -> MagicMock:
-    """A mock genai.Client with async generate_content."""
+    """A mock genai.Client with async generate_content and generate_content_stream."""
     client = MagicMock()
     client.aio = MagicMock()
     client.aio.models = MagicMock()
     client.aio.models.generate_content = AsyncMock()
+    client.aio.models.generate_content_stream = AsyncMock()
     return client
 
 
@@ -128,28 +161,54 @@ def mock_claim_generation_service() -> AsyncMock:
     return service
 
 
+@pytest.fixture(scope="session")
+def app_instance() -> FastAPI:
+    """The application under test; fixtures take it rather than importing src.main."""
+    return app
+
+
+@pytest.fixture(scope="session")
+def session_client(app_instance: FastAPI) -> Generator[TestClient, None, None]:
+    """One TestClient for the whole run, with the app lifespan skipped.
+
+    Router tests either need no services or swap a mock onto app.state, so
+    the startup wiring (settings, Gemini client, extractors) is replaced by
+    a no-op. The service is None, as after a keyless startup, unless a test
+    swaps one in. Tests of the real startup build their own TestClient.
+    """
+
+    @asynccontextmanager
+    async def _no_lifespan(_app: FastAPI) -> AsyncIterator[None]:
+        yield
+
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setattr(app_instance.router, "lifespan_context", _no_lifespan)
+    with TestClient(app_instance) as client:
+        app_instance.state.claim_generation_service = None
+        yield client
+    monkeypatch.undo()
+
+
 @pytest.fixture()
 def app_client(
+    app_instance: FastAPI,
+    session_client: TestClient,
     mock_claim_generation_service: AsyncMock,
 ) -> Generator[TestClient, None, None]:
-    """FastAPI TestClient with mocked service dependency.
+    """Shared TestClient with a mocked service on app.state.
 
-    Overrides the get_claim_generation_service dependency so no real
-    Gemini calls are made during endpoint tests.
+    No real Gemini calls are made during endpoint tests.
     """
-    os.environ.setdefault("GEMINI_API_KEY", "test-key")
-
-    app.dependency_overrides[get_claim_generation_service] = (
-        lambda: mock_claim_generation_service
-    )
-    with TestClient(app) as client:
-        yield client
-    app.dependency_overrides.clear()
+    state = app_instance.state
+    original = state.claim_generation_service
+    state.claim_generation_service = mock_claim_generation_service
+    yield session_client
+    state.claim_generation_service = original
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def sample_claim_generation_response() -> ClaimGenerationResponse:
-    """A complete ClaimGenerationResponse for endpoint testing."""
+    """A complete ClaimGenerationResponse for endpoint testing (read-only, shared)."""
     return ClaimGenerationResponse(
         claims=[
             ClaimResponse(
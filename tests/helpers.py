@@ -0,0 +1,27 @@
+"""Plain test helpers shared across test modules."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+class FastAsyncStub:
+    """Async callable returning canned results without Mock call bookkeeping.
+
+    Results are returned in order and the last one repeats; exception
+    instances are raised instead. Use AsyncMock where a test needs richer
+    call assertions than a count and the last keyword arguments.
+    """
+
+    def __init__(self, *results: Any) -> None:
+        self._results = results
+        self.calls = 0
+        self.last_kwargs: dict[str, Any] = {}
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        self.calls += 1
+        self.last_kwargs = kwargs
+        result = self._results[min(self.calls, len(self._results)) - 1]
+        if isinstance(result, BaseException):
+            raise result
+        return result
@@ -0,0 +1,26 @@
+"""Fixtures shared by the extraction tests."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+_real_sleep = asyncio.sleep
+
+
+async def _instant_sleep(delay: float, result: Any = None) -> Any:
+    """Yield to the event loop once, without waiting out the delay."""
+    await _real_sleep(0)
+    return result
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make retry backoff and polling waits instant across the package.
+
+    tenacity's async retry sleeps through asyncio.sleep, so patching it
+    covers every extractor's backoff without touching decorator internals.
+    """
+    monkeypatch.setattr(asyncio, "sleep", _instant_sleep)
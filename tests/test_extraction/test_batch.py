@@ -0,0 +1,139 @@
+"""Tests for Batch API calls and the extractors' batch mode."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from google.genai import types
+
+from src.exceptions import LLMProviderError, StreamingUnavailableError
+from src.extraction.batch import generate_content_batch
+from src.extraction.combined_extractor import CombinedExtractor
+from src.extraction.topic_extractor import TopicExtractor
+
+# Captured before the autouse fixtures patch asyncio.sleep
+_real_sleep = asyncio.sleep
+
+
+def _job(state: types.JobState, text: str | None = None) -> types.BatchJob:
+    dest = None
+    if text is not None:
+        response = types.GenerateContentResponse(
+            candidates=[
+                types.Candidate(
+                    content=types.Content(role="model", parts=[types.Part(text=text)]),
+                    finish_reason=types.FinishReason.STOP,
+                )
+            ]
+        )
+        dest = types.BatchJobDestination(
+            inlined_responses=[types.InlinedResponse(response=response)]
+        )
+    return types.BatchJob(name="batches/123", state=state, dest=dest)
+
+
+@pytest.fixture(autouse=True)
+def no_poll_sleep(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    """Skip the polling backoff sleeps."""
+    sleep = AsyncMock()
+    monkeypatch.setattr("src.extraction.batch.asyncio.sleep", sleep)
+    return sleep
+
+
+async def test_batch_polls_until_succeeded(
+    mock_genai_client: MagicMock, no_poll_sleep: AsyncMock
+) -> None:
+    """The job is polled with growing delays until it succeeds."""
+    mock_genai_client.aio.batches.create = AsyncMock(
+        return_value=_job(types.JobState.JOB_STATE_PENDING)
+    )
+    mock_genai_client.aio.batches.get = AsyncMock(
+        side_effect=[
+            _job(types.JobState.JOB_STATE_RUNNING),
+            _job(types.JobState.JOB_STATE_SUCCEEDED, '{"topics": ["A"]}'),
+        ]
+    )
+    config = types.GenerateContentConfig(temperature=0.2)
+
+    response = await generate_content_batch(
+        mock_genai_client, "gemini-2.5-flash", "prompt", config
+    )
+
+    assert response.text == '{"topics": ["A"]}'
+    request = mock_genai_client.aio.batches.create.call_args.kwargs["src"][0]
+    assert request.contents == "prompt"
+    assert request.config is config
+    assert [c.args[0] for c in no_poll_sleep.call_args_list] == [5.0, 10.0]
+
+
+async def test_batch_failed_job_raises(mock_genai_client: MagicMock) -> None:
+    """A failed or expired job surfaces as LLMProviderError and is not resubmitted."""
+    mock_genai_client.aio.batches.create = AsyncMock(
+        return_value=_job(types.JobState.JOB_STATE_EXPIRED)
+    )
+    extractor: Any = TopicExtractor(
+        mock_genai_client, "gemini-2.5-flash", 0.2, batch_mode=True
+    )
+
+    with pytest.raises(LLMProviderError):
+        await extractor.extract("some source text " * 10)
+
+    assert mock_genai_client.aio.batches.create.await_count == 1
+
+
+async def test_batch_timeout_cancels_job(
+    mock_genai_client: MagicMock, no_poll_sleep: AsyncMock
+) -> None:
+    """A job still running at the timeout is cancelled and reported as LLMProviderError."""
+
+    async def _yield(_: float) -> None:
+        await _real_sleep(0)
+
+    no_poll_sleep.side_effect = _yield
+    running = _job(types.JobState.JOB_STATE_RUNNING)
+    mock_genai_client.aio.batches.create = AsyncMock(return_value=running)
+    mock_genai_client.aio.batches.get = AsyncMock(return_value=running)
+    mock_genai_client.aio.batches.cancel = AsyncMock()
+
+    with pytest.raises(LLMProviderError, match="did not finish within"):
+        await generate_content_batch(
+            mock_genai_client,
+            "gemini-2.5-flash",
+            "prompt",
+            types.GenerateContentConfig(),
+            timeout=0.01,
+        )
+
+    mock_genai_client.aio.batches.cancel.assert_awaited_once_with(name="batches/123")
+
+
+async def test_topic_extractor_batch_mode(mock_genai_client: MagicMock) -> None:
+    """In batch mode the extractor parses the batch response, not generate_content."""
+    mock_genai_client.aio.batches.create = AsyncMock(
+        return_value=_job(types.JobState.JOB_STATE_SUCCEEDED, '{"topics": ["Batch topic"]}')
+    )
+    extractor: Any = TopicExtractor(
+        mock_genai_client, "gemini-2.5-flash", 0.2, batch_mode=True
+    )
+
+    result = await extractor.extract("some source text " * 10)
+
+    assert result == ["Batch topic"]
+    mock_genai_client.aio.models.generate_content.assert_not_awaited()
+
+
+async def test_combined_extractor_batch_mode_stream_unavailable(
+    mock_genai_client: MagicMock,
+) -> None:
+    """In batch mode, streaming is refused instead of calling Gemini live."""
+    mock_genai_client.aio.batches.create = AsyncMock()
+    extractor = CombinedExtractor(mock_genai_client, "gemini-2.5-flash", 0.2, batch_mode=True)
+
+    with pytest.raises(StreamingUnavailableError):
+        _ = [item async for item in extractor.extract_stream("some source text " * 10)]
+
+    mock_genai_client.aio.models.generate_content_stream.assert_not_called()
+    mock_genai_client.aio.batches.create.assert_not_awaited()
@@ -5,9 +5,10 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 import pytest
-from tenacity import wait_none
 
+from src.config.prompts.claim_extraction import CLAIM_EXTRACTION_PROMPT
 from src.exceptions import ExtractionError
+from src.extraction.claim_extractor import ClaimExtractor
 from src.schemas.llm import ClaimWithTopicBaseResult, ClaimWithTopicResult
 
 if TYPE_CHECKING:
@@ -17,16 +18,11 @@ if TYPE_CHECKING:
 @pytest.fixture()
 def claim_extractor(mock_genai_client: MagicMock) -> Any:
     """ClaimExtractor wired to a mock Gemini client."""
-    from src.extraction.claim_extractor import ClaimExtractor
-
-    extractor = ClaimExtractor(
+    return ClaimExtractor(
         client=mock_genai_client,
         model="gemini-2.5-flash",
         temperature=0.2,
     )
-    # Disable retry wait times in tests
-    extractor._call_and_parse.retry.wait = wait_none()  # type: ignore[attr-defined]
-    return extractor
 
 
 async def test_extract_claims_success(
@@ -52,7 +48,7 @@ async def test_extract_claims_success(
     assert len(result) == 1
     assert result[0].topic == "Energy"
     assert result[0].claims == ["Claim 1", "Claim 2"]
-    generate.assert_awaited_once()
+    assert generate.await_count == 1
 
 
 async def test_extract_claims_fallback_parsing(
@@ -81,6 +77,7 @@ async def test_extract_claims_fallback_parsing(
     assert result[0].claims == ["Fallback claim"]
 
 
+@pytest.mark.slow
 async def test_extract_claims_parse_failure_raises(
     claim_extractor: Any,
     mock_genai_client: MagicMock,
@@ -137,6 +134,65 @@ async def test_extract_claims_includes_topics_in_prompt(
     assert "Technology" in contents_arg
 
 
+async def test_extract_claims_prompt_matches_template(
+    claim_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_response: Any,
+) -> None:
+    """The precomputed prompt is identical to formatting the template."""
+    parsed = ClaimWithTopicResult(claim_topics=[])
+    generate: AsyncMock = mock_genai_client.aio.models.generate_content
+    generate.return_value = mock_gemini_response(parsed=parsed, finish_reason="STOP")
+
+    await claim_extractor.extract("Text with {braces} in it. " * 5, ["Science"])
+
+    assert generate.call_args.kwargs["contents"] == CLAIM_EXTRACTION_PROMPT.format(
+        source_text="Text with {braces} in it. " * 5, topics='["Science"]'
+    )
+
+
+async def test_extract_claims_scales_output_cap_with_topics(
+    claim_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_response: Any,
+) -> None:
+    """max_output_tokens grows with the topic count, up to the 8192 ceiling."""
+    parsed = ClaimWithTopicResult(claim_topics=[])
+    generate: AsyncMock = mock_genai_client.aio.models.generate_content
+    generate.return_value = mock_gemini_response(parsed=parsed, finish_reason="STOP")
+
+    await claim_extractor.extract("some source text " * 10, ["A", "B"])
+    await claim_extractor.extract("some source text " * 10, [str(i) for i in range(30)])
+    await claim_extractor.extract("other source text " * 10, ["C", "D"])
+
+    configs = [c.kwargs["config"] for c in generate.call_args_list]
+    assert [config.max_output_tokens for config in configs] == [1312, 8192, 1312]
+    assert configs[2] is configs[0]
+    assert generate.call_args_list[0].kwargs["config"].safety_settings
+
+
+async def test_extract_claims_truncated_at_scaled_cap_retries_at_full_cap(
+    claim_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_response: Any,
+) -> None:
+    """A response cut off by the per-topic cap is requested again at the full cap."""
+    parsed = ClaimWithTopicResult(
+        claim_topics=[ClaimWithTopicBaseResult(topic="A", claims=["Claim 1"])]
+    )
+    generate: AsyncMock = mock_genai_client.aio.models.generate_content
+    generate.side_effect = [
+        mock_gemini_response(text='{"claim_topics": [', finish_reason="MAX_TOKENS"),
+        mock_gemini_response(parsed=parsed, finish_reason="STOP"),
+    ]
+
+    result = await claim_extractor.extract("some source text " * 10, ["A"])
+
+    assert result[0].claims == ["Claim 1"]
+    caps = [c.kwargs["config"].max_output_tokens for c in generate.call_args_list]
+    assert caps == [912, 8192]
+
+
 async def test_extract_claims_json_repair_fallback(
     claim_extractor: Any,
     mock_genai_client: MagicMock,
@@ -162,9 +218,10 @@ async def test_extract_claims_json_repair_fallback(
     assert len(result) == 1
     assert result[0].claims == ["Claim one"]
     # Should succeed on first attempt (repair works)
-    generate.assert_awaited_once()
+    assert generate.await_count == 1
 
 
+@pytest.mark.slow
 async def test_extract_claims_retry_on_parse_failure_then_succeed(
     claim_extractor: Any,
     mock_genai_client: MagicMock,
@@ -196,3 +253,71 @@ async def test_extract_claims_retry_on_parse_failure_then_succeed(
     assert len(result) == 1
     assert result[0].claims == ["Good claim"]
     assert generate.await_count == 2
+
+
+async def test_extract_claims_fanout_per_topic(
+    mock_genai_client: MagicMock,
+    mock_gemini_response: Any,
+) -> None:
+    """With fan-out enabled, each topic gets its own call and order is preserved."""
+    extractor = ClaimExtractor(
+        client=mock_genai_client,
+        model="gemini-2.5-flash",
+        temperature=0.2,
+        fanout_concurrency=2,
+    )
+
+    async def _respond(*, contents: str, **_: Any) -> Any:
+        topic = "Science" if '["Science"]' in contents else "Technology"
+        parsed = ClaimWithTopicResult(
+            claim_topics=[
+                ClaimWithTopicBaseResult(topic=topic.lower(), claims=[f"{topic} claim"]),
+            ]
+        )
+        return mock_gemini_response(parsed=parsed, finish_reason="STOP")
+
+    generate: AsyncMock = mock_genai_client.aio.models.generate_content
+    generate.side_effect = _respond
+
+    result = await extractor.extract(
+        "some source text " * 10,
+        ["Science", "Technology"],
+    )
+
+    assert generate.await_count == 2
+    assert [item.topic for item in result] == ["Science", "Technology"]
+    assert result[1].claims == ["Technology claim"]
+
+
+async def test_extract_stream_fanout_per_topic(
+    mock_genai_client: MagicMock,
+    mock_gemini_response: Any,
+) -> None:
+    """With fan-out enabled, streaming makes the same per-topic calls as extract."""
+    extractor = ClaimExtractor(
+        client=mock_genai_client,
+        model="gemini-2.5-flash",
+        temperature=0.2,
+        fanout_concurrency=2,
+    )
+
+    async def _respond(*, contents: str, **_: Any) -> Any:
+        topic = "Science" if '["Science"]' in contents else "Technology"
+        parsed = ClaimWithTopicResult(
+            claim_topics=[ClaimWithTopicBaseResult(topic=topic, claims=[f"{topic} claim"])]
+        )
+        return mock_gemini_response(parsed=parsed, finish_reason="STOP")
+
+    generate: AsyncMock = mock_genai_client.aio.models.generate_content
+    generate.side_effect = _respond
+
+    items = [
+        item
+        async for item in extractor.extract_stream(
+            "some source text " * 10, ["Science", "Technology"]
+        )
+    ]
+
+    assert generate.await_count == 2
+    assert sorted(item.topic for item in items) == ["Science", "Technology"]
+    mock_genai_client.aio.models.generate_content_stream.assert_not_awaited()
@@ -0,0 +1,294 @@
+"""Tests for CombinedExtractor with mocked Gemini client."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from google.genai import errors as genai_errors
+from google.genai import types
+
+from src.exceptions import ExtractionError, SafetyFilterError
+from src.extraction.combined_extractor import CombinedExtractor
+from src.extraction.rate_limiter import GeminiRateLimiter
+from src.schemas.llm import ClaimWithTopicBaseResult, TopicsWithClaimsResult
+
+if TYPE_CHECKING:
+    from unittest.mock import AsyncMock, MagicMock
+
+
+@pytest.fixture()
+def combined_extractor(mock_genai_client: MagicMock) -> Any:
+    """CombinedExtractor wired to a mock Gemini client."""
+    return CombinedExtractor(
+        client=mock_genai_client,
+        model="gemini-2.5-flash",
+        temperature=0.2,
+    )
+
+
+async def test_extract_combined_success(
+    combined_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_response: Any,
+) -> None:
+    """One Gemini call returns topics with their nested claims."""
+    parsed = TopicsWithClaimsResult(
+        topics=[
+            ClaimWithTopicBaseResult(topic="Energy", claims=["Claim 1", "Claim 2"]),
+            ClaimWithTopicBaseResult(topic="Policy", claims=["Claim 3"]),
+        ]
+    )
+    response = mock_gemini_response(parsed=parsed, finish_reason="STOP")
+    generate: AsyncMock = mock_genai_client.aio.models.generate_content
+    generate.return_value = response
+
+    result = await combined_extractor.extract("some source text " * 10)
+
+    assert [item.topic for item in result] == ["Energy", "Policy"]
+    assert result[0].claims == ["Claim 1", "Claim 2"]
+    assert generate.await_count == 1
+
+
+async def test_extract_combined_fallback_parsing(
+    combined_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_response: Any,
+) -> None:
+    """When .parsed is None, falls back to parsing .text as JSON."""
+    response = mock_gemini_response(
+        parsed=None,
+        text='{"topics": [{"topic": "Policy", "claims": ["Fallback claim"]}]}',
+        finish_reason="STOP",
+    )
+    generate: AsyncMock = mock_genai_client.aio.models.generate_content
+    generate.return_value = response
+
+    result = await combined_extractor.extract("some source text " * 10)
+
+    assert len(result) == 1
+    assert result[0].claims == ["Fallback claim"]
+
+
+@pytest.mark.slow
+async def test_extract_combined_parse_failure_raises(
+    combined_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_response: Any,
+) -> None:
+    """Unrepairable JSON raises ExtractionError after retries."""
+    response = mock_gemini_response(
+        parsed=None,
+        text="not valid json at all",
+        finish_reason="STOP",
+    )
+    generate: AsyncMock = mock_genai_client.aio.models.generate_content
+    generate.return_value = response
+
+    with pytest.raises(ExtractionError):
+        await combined_extractor.extract("some source text " * 10)
+
+    assert generate.await_count == 3
+
+
+async def test_extract_combined_safety_filter_raises(
+    combined_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_response: Any,
+) -> None:
+    """Safety-blocked response raises SafetyFilterError without retry."""
+    response = mock_gemini_response(
+        parsed=None,
+        text=None,
+        finish_reason=types.FinishReason.SAFETY,
+    )
+    generate: AsyncMock = mock_genai_client.aio.models.generate_content
+    generate.return_value = response
+
+    with pytest.raises(SafetyFilterError):
+        await combined_extractor.extract("some source text " * 10)
+
+    assert generate.await_count == 1
+
+
+async def test_extract_stream_yields_topics_incrementally(
+    combined_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_stream: Any,
+) -> None:
+    """Streamed topics are yielded in order as each one completes."""
+    stream: AsyncMock = mock_genai_client.aio.models.generate_content_stream
+    stream.return_value = mock_gemini_stream(
+        '{"topics": [{"topic": "Energy", "claims": ["Cla',
+        'im 1"]}, {"topic": "Policy", ',
+        '"claims": ["Claim 2"]}]}',
+    )
+
+    result = [item async for item in combined_extractor.extract_stream("text " * 20)]
+
+    assert [item.topic for item in result] == ["Energy", "Policy"]
+    assert result[0].claims == ["Claim 1"]
+
+
+async def test_extract_stream_retries_transient_error_before_first_item(
+    combined_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_stream: Any,
+) -> None:
+    """A 5xx opening the stream is retried like the non-streaming call."""
+    stream: AsyncMock = mock_genai_client.aio.models.generate_content_stream
+    stream.side_effect = [
+        genai_errors.ServerError(503, {}),
+        mock_gemini_stream('{"topics": [{"topic": "Energy", "claims": ["Claim 1"]}]}'),
+    ]
+
+    result = [item async for item in combined_extractor.extract_stream("text " * 20)]
+
+    assert [item.topic for item in result] == ["Energy"]
+    assert stream.await_count == 2
+
+
+async def test_extract_stream_invalid_item_recovered_from_full_parse(
+    combined_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_stream: Any,
+) -> None:
+    """An item failing validation is recovered by the full parse, not dropped."""
+    stream: AsyncMock = mock_genai_client.aio.models.generate_content_stream
+    stream.return_value = mock_gemini_stream(
+        '{"topics": [{"topic": "Energy", "claims": ["Claim 1"]}, ',
+        '{"topic": "Policy", "claims": ["Claim 2",]}, ',
+        '{"topic": "Trade", "claims": ["Claim 3"]}]}',
+    )
+
+    result = [item async for item in combined_extractor.extract_stream("text " * 20)]
+
+    assert [item.topic for item in result] == ["Energy", "Policy", "Trade"]
+
+
+async def test_extract_stream_invalid_item_unrecoverable_raises(
+    combined_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_stream: Any,
+) -> None:
+    """An item the full parse cannot recover either ends the stream with an error."""
+    stream: AsyncMock = mock_genai_client.aio.models.generate_content_stream
+    stream.return_value = mock_gemini_stream(
+        '{"topics": [{"topic": "Energy", "claims": ["Claim 1"]}, ',
+        '{"topic": "Policy"}]}',
+    )
+    result: list[ClaimWithTopicBaseResult] = []
+
+    with pytest.raises(ExtractionError):
+        async for item in combined_extractor.extract_stream("text " * 20):
+            result.append(item)
+
+    assert [item.topic for item in result] == ["Energy"]
+
+
+async def test_extract_stream_slow_consumer_releases_concurrency_slot(
+    mock_genai_client: MagicMock,
+    mock_gemini_stream: Any,
+) -> None:
+    """The response is drained in the background, freeing the slot for other calls."""
+    limiter = GeminiRateLimiter(max_concurrency=1)
+    extractor = CombinedExtractor(
+        mock_genai_client, "gemini-2.5-flash", 0.2, rate_limiter=limiter
+    )
+    stream: AsyncMock = mock_genai_client.aio.models.generate_content_stream
+    stream.return_value = mock_gemini_stream(
+        '{"topics": [{"topic": "Energy", "claims": ["Claim 1"]}, ',
+        '{"topic": "Policy", "claims": ["Claim 2"]}]}',
+    )
+    items = extractor.extract_stream("text " * 20)
+
+    first = await anext(items)
+    # Stall the consumer while another call needs the only slot
+    async with asyncio.timeout(1), limiter.limit("other prompt"):
+        pass
+    rest = [item async for item in items]
+
+    assert [item.topic for item in [first, *rest]] == ["Energy", "Policy"]
+
+
+async def test_extract_stream_falls_back_to_full_parse(
+    combined_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_stream: Any,
+) -> None:
+    """Output that cannot be scanned incrementally is parsed once the stream ends."""
+    stream: AsyncMock = mock_genai_client.aio.models.generate_content_stream
+    stream.return_value = mock_gemini_stream(
+        '{"topics": [{"topic": "Energy", "claims": ["Claim 1",]}]',
+    )
+
+    result = [item async for item in combined_extractor.extract_stream("text " * 20)]
+
+    assert [item.topic for item in result] == ["Energy"]
+
+
+async def test_extract_stream_truncated_raises_before_last_item(
+    combined_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_stream: Any,
+) -> None:
+    """A truncated stream ends in ExtractionError before its last item is yielded."""
+    stream: AsyncMock = mock_genai_client.aio.models.generate_content_stream
+    stream.return_value = mock_gemini_stream(
+        '{"topics": [{"topic": "Energy", "claims": ["Claim 1"]}, ',
+        '{"topic": "Policy", "claims": ["Claim 2"]}, {"topic": "Tr',
+        finish_reason=types.FinishReason.MAX_TOKENS,
+    )
+    result: list[ClaimWithTopicBaseResult] = []
+
+    with pytest.raises(ExtractionError, match="truncated"):
+        async for item in combined_extractor.extract_stream("text " * 20):
+            result.append(item)
+
+    assert [item.topic for item in result] == ["Energy"]
+
+
+async def test_extract_stream_safety_filter_raises(
+    combined_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_stream: Any,
+) -> None:
+    """A safety-blocked stream raises SafetyFilterError."""
+    stream: AsyncMock = mock_genai_client.aio.models.generate_content_stream
+    stream.return_value = mock_gemini_stream("", finish_reason=types.FinishReason.SAFETY)
+
+    with pytest.raises(SafetyFilterError):
+        _ = [item async for item in combined_extractor.extract_stream("text " * 20)]
+
+
+async def test_extract_many_single_call_in_input_order(
+    combined_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_response: Any,
+) -> None:
+    """Several texts share one call; results map back by document index."""
+    response = mock_gemini_response(
+        parsed=None,
+        text=(
+            '{"documents": ['
+            '{"document": 1, "topics": [{"topic": "Policy", "claims": ["P1"]}]},'
+            '{"document": 0, "topics": [{"topic": "Energy", "claims": ["E1"]}]}'
+            "]}"
+        ),
+        finish_reason="STOP",
+    )
+    generate: AsyncMock = mock_genai_client.aio.models.generate_content
+    generate.return_value = response
+
+    result = await combined_extractor.extract_many(["first text", "second text", "third"])
+
+    assert [[item.topic for item in topics] for topics in result] == [
+        ["Energy"],
+        ["Policy"],
+        [],
+    ]
+    assert generate.await_count == 1
+    contents = generate.call_args.kwargs["contents"]
+    assert "<<<DOC 0>>>\nfirst text\n\n<<<DOC 1>>>\nsecond text" in contents
+
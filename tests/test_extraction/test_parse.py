@@ -0,0 +1,32 @@
+"""Tests for the shared structured-output parse chain."""
+
+from __future__ import annotations
+
+import pytest
+
+from src.exceptions import ExtractionError
+from src.extraction._parse import parse_structured_text
+from src.schemas.llm import TopicsWithClaimsResult
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"topics": [{"topic": "A", "claims": ["x"]}, {"top',
+        '{"topics": [{"topic": "A", "claims": ["x"]}, {"topic": "B", "cl',
+    ],
+    ids=["empty-trailing-object", "partial-trailing-object"],
+)
+def test_truncated_trailing_item_is_dropped(text: str) -> None:
+    """A list item cut off by truncation is dropped instead of failing validation."""
+    result = parse_structured_text(text, TopicsWithClaimsResult, "combined extraction")
+
+    assert [(item.topic, item.claims) for item in result.topics] == [("A", ["x"])]
+
+
+def test_complete_json_keeps_invalid_items_failing() -> None:
+    """Items of complete JSON are never dropped: an invalid one still fails the parse."""
+    text = '{"topics": [{"topic": "A", "claims": ["x"]}, {"topic": "B"}]}'
+
+    with pytest.raises(ExtractionError):
+        parse_structured_text(text, TopicsWithClaimsResult, "combined extraction")
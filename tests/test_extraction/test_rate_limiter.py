@@ -0,0 +1,131 @@
+"""Tests for the client-side Gemini rate limiter."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from google.genai import errors as genai_errors
+
+from src.extraction.rate_limiter import (
+    GeminiRateLimiter,
+    estimate_tokens,
+    retry_after_seconds,
+)
+
+
+class _FakeClock:
+    """Monotonic clock advanced by the patched asyncio.sleep."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture()
+def clock(monkeypatch: pytest.MonkeyPatch) -> _FakeClock:
+    """Patch the limiter's clock and sleep so tests run instantly."""
+    fake = _FakeClock()
+    monkeypatch.setattr("src.extraction.rate_limiter.time.monotonic", fake.monotonic)
+    monkeypatch.setattr("src.extraction.rate_limiter.asyncio.sleep", fake.sleep)
+    return fake
+
+
+def _rate_limit_error(response_json: dict[str, object]) -> genai_errors.ClientError:
+    return genai_errors.ClientError(429, response_json)
+
+
+def test_estimate_tokens() -> None:
+    """Token estimate is roughly one token per four characters."""
+    assert estimate_tokens("x" * 400) == 101
+
+
+async def test_rpm_budget_queues_excess_requests(clock: _FakeClock) -> None:
+    """Requests beyond the per-minute budget wait for the bucket to refill."""
+    limiter = GeminiRateLimiter(rpm=60)
+
+    for _ in range(60):
+        await limiter.acquire(1)
+    assert clock.sleeps == []
+
+    await limiter.acquire(1)
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+async def test_tpm_budget_counts_prompt_tokens(clock: _FakeClock) -> None:
+    """A large prompt drains the token budget and the next call waits."""
+    limiter = GeminiRateLimiter(tpm=6000)
+
+    await limiter.acquire(6000)
+    await limiter.acquire(600)
+
+    assert clock.sleeps == [pytest.approx(6.0)]
+
+
+async def test_penalize_blocks_for_retry_delay(clock: _FakeClock) -> None:
+    """A server retry delay pauses the next admission."""
+    limiter = GeminiRateLimiter(rpm=1000)
+
+    limiter.penalize(12.5)
+    await limiter.acquire(1)
+
+    assert clock.sleeps == [pytest.approx(12.5)]
+
+
+async def test_max_concurrency_caps_calls_in_flight() -> None:
+    """Calls beyond max_concurrency wait until an earlier call finishes."""
+    limiter = GeminiRateLimiter(max_concurrency=2)
+    release = asyncio.Event()
+    in_flight = 0
+    peak = 0
+
+    async def call() -> None:
+        nonlocal in_flight, peak
+        async with limiter.limit("prompt"):
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await release.wait()
+            in_flight -= 1
+
+    tasks = [asyncio.create_task(call()) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert in_flight == 2
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert peak == 2
+
+
+def test_retry_after_from_retry_info() -> None:
+    """RetryInfo.retryDelay in the error details is honored."""
+    exc = _rate_limit_error(
+        {
+            "error": {
+                "code": 429,
+                "status": "RESOURCE_EXHAUSTED",
+                "details": [
+                    {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "30s"}
+                ],
+            }
+        }
+    )
+    assert retry_after_seconds(exc) == 30.0
+
+
+def test_retry_after_from_message() -> None:
+    """Falls back to "retry in Ns" in the error message."""
+    exc = _rate_limit_error({"error": {"message": "Quota exceeded. Please retry in 7.5s."}})
+    assert retry_after_seconds(exc) == 7.5
+
+
+def test_retry_after_missing() -> None:
+    """Errors without a delay, and non-API errors, return None."""
+    assert retry_after_seconds(_rate_limit_error({"error": {"message": "slow down"}})) is None
+    assert retry_after_seconds(ValueError("nope")) is None
@@ -0,0 +1,51 @@
+"""Tests for the shared retry wait strategy."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+from google.genai import errors as genai_errors
+from tenacity import wait_fixed
+
+from src.exceptions import ExtractionError, SafetyFilterError
+from src.extraction._retry import WaitRetryAfter, is_retryable
+
+
+def _retry_state(exc: BaseException) -> MagicMock:
+    state = MagicMock()
+    state.outcome.exception.return_value = exc
+    return state
+
+
+def test_wait_honors_server_retry_delay() -> None:
+    """A longer server-requested delay wins over the fallback backoff."""
+    wait = WaitRetryAfter(wait_fixed(2))
+    exc = genai_errors.ClientError(
+        429, {"error": {"message": "Quota exceeded. Please retry in 17s."}}
+    )
+
+    assert wait(_retry_state(exc)) == 17.0
+
+
+def test_wait_falls_back_without_delay() -> None:
+    """Errors without a retry delay use the fallback backoff."""
+    wait = WaitRetryAfter(wait_fixed(2))
+
+    assert wait(_retry_state(ValueError("parse failure"))) == 2
+
+
+@pytest.mark.parametrize(
+    ("exc", "expected"),
+    [
+        (ExtractionError("bad json"), True),
+        (SafetyFilterError(), False),
+        (genai_errors.ServerError(503, {}), True),
+        (genai_errors.ClientError(429, {}), True),
+        (genai_errors.ClientError(400, {}), False),
+        (ValueError("unrelated"), False),
+    ],
+)
+def test_is_retryable(exc: BaseException, expected: bool) -> None:
+    """Transient Gemini errors and parse failures retry; safety blocks do not."""
+    assert is_retryable(exc) is expected
@@ -6,28 +6,25 @@ from typing import TYPE_CHECKING, Any
 
 import pytest
 from google.genai import types
-from tenacity import wait_none
 
 from src.exceptions import ExtractionError, SafetyFilterError
+from src.extraction.topic_extractor import TopicExtractor
 from src.schemas.llm import TopicResult
+from src.utils.cache import ResponseCache
+from tests.helpers import FastAsyncStub
 
 if TYPE_CHECKING:
-    from unittest.mock import AsyncMock, MagicMock
+    from unittest.mock import MagicMock
 
 
 @pytest.fixture()
 def topic_extractor(mock_genai_client: MagicMock) -> Any:
     """TopicExtractor wired to a mock Gemini client."""
-    from src.extraction.topic_extractor import TopicExtractor
-
-    extractor = TopicExtractor(
+    return TopicExtractor(
         client=mock_genai_client,
         model="gemini-2.5-flash",
         temperature=0.2,
     )
-    # Disable retry wait times in tests
-    extractor._call_and_parse.retry.wait = wait_none()  # type: ignore[attr-defined]
-    return extractor
 
 
 async def test_extract_topics_success(
@@ -38,34 +35,67 @@ async def test_extract_topics_success(
     """Successful extraction returns list of topic strings."""
     parsed = TopicResult(topics=["Topic A", "Topic B"])
     response = mock_gemini_response(parsed=parsed, finish_reason="STOP")
-    generate: AsyncMock = mock_genai_client.aio.models.generate_content
-    generate.return_value = response
+    generate = FastAsyncStub(response)
+    mock_genai_client.aio.models.generate_content = generate
 
     result = await topic_extractor.extract("some source text " * 10)
 
     assert result == ["Topic A", "Topic B"]
-    generate.assert_awaited_once()
+    assert generate.calls == 1
 
 
-async def test_extract_topics_fallback_to_text_parsing(
+async def test_extract_topics_validates_json_schema_parsed_dict(
     topic_extractor: Any,
     mock_genai_client: MagicMock,
     mock_gemini_response: Any,
 ) -> None:
-    """When .parsed is None, falls back to parsing .text as JSON."""
-    response = mock_gemini_response(
-        parsed=None,
-        text='{"topics": ["Fallback A", "Fallback B"]}',
-        finish_reason="STOP",
-    )
-    generate: AsyncMock = mock_genai_client.aio.models.generate_content
-    generate.return_value = response
+    """With a JSON Schema config, .parsed is a plain dict and gets validated."""
+    response = mock_gemini_response(parsed={"topics": ["Dict A"]}, finish_reason="STOP")
+    generate = FastAsyncStub(response)
+    mock_genai_client.aio.models.generate_content = generate
+
+    result = await topic_extractor.extract("some source text " * 10)
+
+    assert result == ["Dict A"]
+    config = generate.last_kwargs["config"]
+    assert config.response_schema is None
+    assert config.response_json_schema == TopicResult.model_json_schema()
+
+
+@pytest.mark.parametrize(
+    ("parsed", "text", "expected"),
+    [
+        # .parsed missing: plain JSON text
+        (None, '{"topics": ["Fallback A", "Fallback B"]}', ["Fallback A", "Fallback B"]),
+        # .parsed dict failing validation falls through to the text
+        ({"unexpected": True}, '{"topics": ["From text"]}', ["From text"]),
+        # Malformed JSON is repaired
+        (None, '{"topics": ["Topic A", "Topic B",]}', ["Topic A", "Topic B"]),
+        # Truncated JSON keeps the complete items
+        (None, '{"topics": ["Topic A", "Top', ["Topic A"]),
+    ],
+    ids=["plain-text", "invalid-parsed-dict", "json-repair", "truncated"],
+)
+async def test_extract_topics_text_fallback(
+    topic_extractor: Any,
+    mock_genai_client: MagicMock,
+    mock_gemini_response: Any,
+    parsed: Any,
+    text: str,
+    expected: list[str],
+) -> None:
+    """Without a usable .parsed, topics are parsed from .text in one call."""
+    response = mock_gemini_response(parsed=parsed, text=text, finish_reason="STOP")
+    generate = FastAsyncStub(response)
+    mock_genai_client.aio.models.generate_content = generate
 
     result = await topic_extractor.extract("some source text " * 10)
 
-    assert result == ["Fallback A", "Fallback B"]
+    assert result == expected
+    assert generate.calls == 1
 
 
+@pytest.mark.slow
 async def test_extract_topics_parse_failure_raises(
     topic_extractor: Any,
     mock_genai_client: MagicMock,
@@ -77,14 +107,14 @@ async def test_extract_topics_parse_failure_raises(
         text="invalid json {{{",
         finish_reason="STOP",
     )
-    generate: AsyncMock = mock_genai_client.aio.models.generate_content
-    generate.return_value = response
+    generate = FastAsyncStub(response)
+    mock_genai_client.aio.models.generate_content = generate
 
     with pytest.raises(ExtractionError):
         await topic_extractor.extract("some source text " * 10)
 
     # Should have retried 3 times (ExtractionError is retryable)
-    assert generate.await_count == 3
+    assert generate.calls == 3
 
 
 async def test_extract_topics_safety_filter_raises(
@@ -98,37 +128,17 @@ async def test_extract_topics_safety_filter_raises(
         text=None,
         finish_reason=types.FinishReason.SAFETY,
     )
-    generate: AsyncMock = mock_genai_client.aio.models.generate_content
-    generate.return_value = response
+    generate = FastAsyncStub(response)
+    mock_genai_client.aio.models.generate_content = generate
 
     with pytest.raises(SafetyFilterError):
         await topic_extractor.extract("some source text " * 10)
 
     # SafetyFilterError is NOT retryable — should only call once
-    generate.assert_awaited_once()
-
-
-async def test_extract_topics_json_repair_fallback(
-    topic_extractor: Any,
-    mock_genai_client: MagicMock,
-    mock_gemini_response: Any,
-) -> None:
-    """Malformed JSON is repaired and parsed successfully."""
-    malformed_json = '{"topics": ["Topic A", "Topic B",]}'
-    response = mock_gemini_response(
-        parsed=None,
-        text=malformed_json,
-        finish_reason="STOP",
-    )
-    generate: AsyncMock = mock_genai_client.aio.models.generate_content
-    generate.return_value = response
-
-    result = await topic_extractor.extract("some source text " * 10)
-
-    assert result == ["Topic A", "Topic B"]
-    generate.assert_awaited_once()
+    assert generate.calls == 1
 
 
+@pytest.mark.slow
 async def test_extract_topics_retry_on_parse_failure_then_succeed(
     topic_extractor: Any,
     mock_genai_client: MagicMock,
@@ -143,10 +153,32 @@ async def test_extract_topics_retry_on_parse_failure_then_succeed(
     )
     good_response = mock_gemini_response(parsed=parsed, finish_reason="STOP")
 
-    generate: AsyncMock = mock_genai_client.aio.models.generate_content
-    generate.side_effect = [bad_response, good_response]
+    generate = FastAsyncStub(bad_response, good_response)
+    mock_genai_client.aio.models.generate_content = generate
 
     result = await topic_extractor.extract("some source text " * 10)
 
     assert result == ["Topic A"]
-    assert generate.await_count == 2
+    assert generate.calls == 2
+
+
+async def test_extract_topics_served_from_cache(
+    mock_genai_client: MagicMock,
+    mock_gemini_response: Any,
+) -> None:
+    """Identical source text is served from the response cache on the second call."""
+    extractor = TopicExtractor(
+        client=mock_genai_client,
+        model="gemini-2.5-flash",
+        temperature=0.2,
+        cache=ResponseCache(),
+    )
+    parsed = TopicResult(topics=["Topic A"])
+    generate = FastAsyncStub(mock_gemini_response(parsed=parsed, finish_reason="STOP"))
+    mock_genai_client.aio.models.generate_content = generate
+
+    first = await extractor.extract("some source text " * 10)
+    second = await extractor.extract("some source text " * 10)
+
+    assert first == second == ["Topic A"]
+    assert generate.calls == 1
@@ -2,12 +2,18 @@
 
 from __future__ import annotations
 
+import json
 from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from google.genai import errors as genai_errors
 
 from src.exceptions import ExtractionError, LLMProviderError
+from src.schemas.responses import ClaimResponse
 
 if TYPE_CHECKING:
-    from unittest.mock import AsyncMock
+    from collections.abc import AsyncIterator
 
     from fastapi.testclient import TestClient
 
@@ -38,73 +44,157 @@ def test_generate_claims_success(
     assert "claim" in data["claims"][0]
 
 
-def test_generate_claims_empty_text(app_client: TestClient) -> None:
-    """POST with empty source_text returns 422."""
+@pytest.mark.parametrize(
+    ("path", "method"),
+    [("/generate/claims", "generate_claims"), ("/generate/claims/stream", "stream_claims")],
+)
+@pytest.mark.parametrize(
+    "body",
+    [{"source_text": ""}, {"source_text": "short"}, {"source_text": "x" * 50001}, {}],
+    ids=["empty-text", "too-short", "too-long", "missing-field"],
+)
+def test_generate_claims_validation_422(
+    app_client: TestClient,
+    mock_claim_generation_service: AsyncMock,
+    path: str,
+    method: str,
+    body: dict[str, str],
+) -> None:
+    """Bodies outside the source_text contract return 422 before the service runs."""
+    response = app_client.post(path, json=body)
+
+    assert response.status_code == 422
+    getattr(mock_claim_generation_service, method).assert_not_called()
+
+
+def test_generate_claims_extraction_error(
+    app_client: TestClient,
+    mock_claim_generation_service: AsyncMock,
+    sample_source_text: str,
+) -> None:
+    """Extraction errors surface as 502 with descriptive message."""
+    mock_claim_generation_service.generate_claims.side_effect = ExtractionError(
+        "test extraction error"
+    )
+
     response = app_client.post(
         "/generate/claims",
-        json={"source_text": ""},
+        json={"source_text": sample_source_text},
     )
-    assert response.status_code == 422
 
+    assert response.status_code == 502
+    assert b"test extraction error" in response.content
+
+
+def test_generate_claims_llm_provider_error(
+    app_client: TestClient,
+    mock_claim_generation_service: AsyncMock,
+    sample_source_text: str,
+) -> None:
+    """LLM provider errors surface as 502."""
+    mock_claim_generation_service.generate_claims.side_effect = LLMProviderError()
 
-def test_generate_claims_too_short(app_client: TestClient) -> None:
-    """POST with source_text below min_length returns 422."""
     response = app_client.post(
         "/generate/claims",
-        json={"source_text": "short"},
+        json={"source_text": sample_source_text},
     )
-    assert response.status_code == 422
+
+    assert response.status_code == 502
+    assert b"LLM provider error" in response.content
 
 
-def test_generate_claims_too_long(app_client: TestClient) -> None:
-    """POST with source_text above max_length returns 422."""
+def test_generate_claims_gemini_api_error(
+    app_client: TestClient,
+    mock_claim_generation_service: AsyncMock,
+    sample_source_text: str,
+) -> None:
+    """Gemini API errors that escape the retries surface as 502 JSON."""
+    mock_claim_generation_service.generate_claims.side_effect = genai_errors.ClientError(
+        400, {"error": {"status": "INVALID_ARGUMENT", "message": "bad request"}}
+    )
+
     response = app_client.post(
         "/generate/claims",
-        json={"source_text": "x" * 50001},
+        json={"source_text": sample_source_text},
     )
-    assert response.status_code == 422
 
+    assert response.status_code == 502
+    assert response.json()["detail"] == "LLM provider error: 400 INVALID_ARGUMENT"
+
+
+async def _claims(
+    *claims: ClaimResponse, error: Exception | None = None
+) -> AsyncIterator[ClaimResponse]:
+    for claim in claims:
+        yield claim
+    if error is not None:
+        raise error
+
+
+def test_stream_claims_ndjson(
+    app_client: TestClient,
+    mock_claim_generation_service: AsyncMock,
+    sample_source_text: str,
+) -> None:
+    """POST /generate/claims/stream returns one JSON line per claim."""
+    mock_claim_generation_service.stream_claims = MagicMock(
+        return_value=_claims(
+            ClaimResponse(claim_topic="Energy", claim="E1"),
+            ClaimResponse(claim_topic="Policy", claim="P1"),
+        )
+    )
 
-def test_generate_claims_missing_field(app_client: TestClient) -> None:
-    """POST with empty body returns 422."""
     response = app_client.post(
-        "/generate/claims",
-        json={},
+        "/generate/claims/stream",
+        json={"source_text": sample_source_text},
     )
-    assert response.status_code == 422
 
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [
+        {"claim_topic": "Energy", "claim": "E1"},
+        {"claim_topic": "Policy", "claim": "P1"},
+    ]
 
-def test_generate_claims_extraction_error(
+
+def test_stream_claims_error_before_first_claim(
     app_client: TestClient,
     mock_claim_generation_service: AsyncMock,
     sample_source_text: str,
 ) -> None:
-    """Extraction errors surface as 502 with descriptive message."""
-    mock_claim_generation_service.generate_claims.side_effect = ExtractionError(
-        "test extraction error"
+    """A failure before any claim keeps its HTTP status."""
+    mock_claim_generation_service.stream_claims = MagicMock(
+        return_value=_claims(error=LLMProviderError())
     )
 
     response = app_client.post(
-        "/generate/claims",
+        "/generate/claims/stream",
         json={"source_text": sample_source_text},
     )
 
     assert response.status_code == 502
-    assert "test extraction error" in response.json()["detail"]
+    assert b"LLM provider error" in response.content
 
 
-def test_generate_claims_llm_provider_error(
+def test_stream_claims_error_mid_stream(
     app_client: TestClient,
     mock_claim_generation_service: AsyncMock,
     sample_source_text: str,
 ) -> None:
-    """LLM provider errors surface as 502."""
-    mock_claim_generation_service.generate_claims.side_effect = LLMProviderError()
+    """A failure after the first claim ends the stream with a detail line."""
+    mock_claim_generation_service.stream_claims = MagicMock(
+        return_value=_claims(
+            ClaimResponse(claim_topic="Energy", claim="E1"),
+            error=ExtractionError("truncated"),
+        )
+    )
 
     response = app_client.post(
-        "/generate/claims",
+        "/generate/claims/stream",
         json={"source_text": sample_source_text},
     )
 
-    assert response.status_code == 502
-    assert "LLM provider error" in response.json()["detail"]
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[-1] == {"detail": "truncated"}
@@ -1,59 +1,64 @@
-"""Tests for the web UI route."""
+"""Tests for the web UI route and its CORS policy."""
 
 from __future__ import annotations
 
+import asyncio
 from typing import TYPE_CHECKING
 
+import httpx
 import pytest
-from fastapi.testclient import TestClient
+from fastapi import FastAPI
 
-from src.main import app
+from src.main import SettingsCORSMiddleware
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from fastapi.testclient import TestClient
 
 
-def _clear_gemini_key(monkeypatch: pytest.MonkeyPatch) -> None:
-    """Override GEMINI_API_KEY to empty string so .env file value is ignored."""
-    monkeypatch.setenv("GEMINI_API_KEY", "")
+@pytest.fixture(scope="module")
+def index_response(session_client: TestClient) -> httpx.Response:
+    """GET / fetched once for all index assertions."""
+    response: httpx.Response = session_client.get("/")
+    return response
 
 
-@pytest.fixture()
-def ui_client(monkeypatch: pytest.MonkeyPatch) -> Generator[TestClient, None, None]:
-    """Create a test client for UI tests without GEMINI_API_KEY."""
-    _clear_gemini_key(monkeypatch)
-    with TestClient(app) as client:
-        yield client
+@pytest.mark.parametrize(
+    "needle",
+    ["Claim Extractor", 'id="source-text"', 'id="generate-btn"', "/static/app.js"],
+    ids=["title", "textarea", "generate-button", "app-js"],
+)
+def test_index_contains(index_response: httpx.Response, needle: str) -> None:
+    """GET / body contains the title, textarea, generate button and app.js tag."""
+    assert needle in index_response.text
 
 
-def test_index_returns_html(ui_client: TestClient) -> None:
-    """GET / returns 200 with content-type text/html and body containing Claim Extractor."""
-    response = ui_client.get("/")
-    assert response.status_code == 200
-    assert "text/html" in response.headers["content-type"]
-    assert "Claim Extractor" in response.text
+async def test_index_and_static_served(app_instance: FastAPI) -> None:
+    """GET / serves HTML and GET /static/app.js serves JavaScript.
 
+    Neither route needs the lifespan, so both requests go concurrently
+    through an in-process ASGI transport instead of the TestClient portal.
+    """
+    transport = httpx.ASGITransport(app=app_instance)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        index, app_js = await asyncio.gather(client.get("/"), client.get("/static/app.js"))
 
-def test_index_contains_textarea(ui_client: TestClient) -> None:
-    """GET / response body contains the source-text textarea."""
-    response = ui_client.get("/")
-    assert 'id="source-text"' in response.text
+    assert index.status_code == 200
+    assert "text/html" in index.headers["content-type"]
+    assert app_js.status_code == 200
+    assert "javascript" in app_js.headers["content-type"]
 
 
-def test_index_contains_generate_button(ui_client: TestClient) -> None:
-    """GET / response body contains the generate button."""
-    response = ui_client.get("/")
-    assert 'id="generate-btn"' in response.text
+async def test_cors_origins_read_at_startup(monkeypatch: pytest.MonkeyPatch) -> None:
+    """CORS_ORIGINS set after the middleware is registered still takes effect."""
+    app = FastAPI()
+    app.add_middleware(SettingsCORSMiddleware)
+    monkeypatch.setenv("CORS_ORIGINS", '["https://example.org"]')
 
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.options(
+            "/",
+            headers={"Origin": "https://example.org", "Access-Control-Request-Method": "POST"},
+        )
 
-def test_index_loads_app_js(ui_client: TestClient) -> None:
-    """GET / response body contains the app.js script tag."""
-    response = ui_client.get("/")
-    assert "/static/app.js" in response.text
-
-
-def test_static_app_js_served(ui_client: TestClient) -> None:
-    """GET /static/app.js returns 200 with JavaScript content type."""
-    response = ui_client.get("/static/app.js")
-    assert response.status_code == 200
-    assert "javascript" in response.headers["content-type"]
+    assert response.headers["access-control-allow-origin"] == "https://example.org"
@@ -2,119 +2,416 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from src.exceptions import EmptyExtractionError
+from src.exceptions import EmptyExtractionError, StreamingUnavailableError
 from src.schemas.llm import ClaimWithTopicBaseResult
 from src.schemas.responses import ClaimGenerationResponse
-from src.services.claim_generation import ClaimGenerationService
-
-
-@pytest.fixture()
-def mock_topic_extractor() -> AsyncMock:
-    """Mock TopicExtractor."""
-    return AsyncMock()
-
-
-@pytest.fixture()
-def mock_claim_extractor() -> AsyncMock:
-    """Mock ClaimExtractor."""
-    return AsyncMock()
-
-
-@pytest.fixture()
-def service(
-    mock_topic_extractor: AsyncMock,
-    mock_claim_extractor: AsyncMock,
-) -> ClaimGenerationService:
-    """ClaimGenerationService with mocked extractors."""
-    return ClaimGenerationService(mock_topic_extractor, mock_claim_extractor)
-
-
-async def test_generate_claims_success(
-    service: ClaimGenerationService,
-    mock_topic_extractor: AsyncMock,
-    mock_claim_extractor: AsyncMock,
-    sample_source_text: str,
-) -> None:
-    """Service returns ClaimGenerationResponse with correct structure."""
-    mock_topic_extractor.extract.return_value = ["Topic A", "Topic B"]
-    mock_claim_extractor.extract.return_value = [
-        ClaimWithTopicBaseResult(
-            topic="Topic A",
-            claims=["Claim A1", "Claim A2"],
-        ),
-        ClaimWithTopicBaseResult(
-            topic="Topic B",
-            claims=["Claim B1"],
-        ),
-    ]
-
-    result = await service.generate_claims(sample_source_text)
-
-    assert isinstance(result, ClaimGenerationResponse)
-    assert len(result.claims) == 3
-    mock_topic_extractor.extract.assert_awaited_once_with(sample_source_text)
-    mock_claim_extractor.extract.assert_awaited_once()
-
-
-async def test_generate_claims_empty_topics_raises(
-    service: ClaimGenerationService,
-    mock_topic_extractor: AsyncMock,
-    sample_source_text: str,
-) -> None:
-    """Empty topic list raises EmptyExtractionError."""
-    mock_topic_extractor.extract.return_value = []
-
-    with pytest.raises(EmptyExtractionError):
-        await service.generate_claims(sample_source_text)
-
-
-async def test_generate_claims_empty_claims_raises(
-    service: ClaimGenerationService,
-    mock_topic_extractor: AsyncMock,
-    mock_claim_extractor: AsyncMock,
-    sample_source_text: str,
-) -> None:
-    """Empty claims for all topics raises EmptyExtractionError."""
-    mock_topic_extractor.extract.return_value = ["Topic A"]
-    mock_claim_extractor.extract.return_value = [
-        ClaimWithTopicBaseResult(topic="Topic A", claims=[]),
-    ]
-
-    with pytest.raises(EmptyExtractionError):
-        await service.generate_claims(sample_source_text)
-
-
-async def test_generate_claims_transforms_output_correctly(
-    service: ClaimGenerationService,
-    mock_topic_extractor: AsyncMock,
-    mock_claim_extractor: AsyncMock,
-    sample_source_text: str,
-) -> None:
-    """Verify flattening: 2 topics with 3+2 claims yields 5 ClaimResponse items."""
-    mock_topic_extractor.extract.return_value = ["Energy", "Policy"]
-    mock_claim_extractor.extract.return_value = [
-        ClaimWithTopicBaseResult(
-            topic="Energy",
-            claims=["Energy claim 1", "Energy claim 2", "Energy claim 3"],
-        ),
-        ClaimWithTopicBaseResult(
-            topic="Policy",
-            claims=["Policy claim 1", "Policy claim 2"],
-        ),
-    ]
-
-    result = await service.generate_claims(sample_source_text)
-
-    assert len(result.claims) == 5
-
-    # Check topic assignments
-    energy_claims = [c for c in result.claims if c.claim_topic == "Energy"]
-    policy_claims = [c for c in result.claims if c.claim_topic == "Policy"]
-    assert len(energy_claims) == 3
-    assert len(policy_claims) == 2
-    assert energy_claims[0].claim == "Energy claim 1"
-    assert policy_claims[1].claim == "Policy claim 2"
+from src.services.claim_generation import SINGLE_TOPIC_LABEL, ClaimGenerationService
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
+
+async def _items(*items: ClaimWithTopicBaseResult) -> AsyncIterator[ClaimWithTopicBaseResult]:
+    for item in items:
+        yield item
+
+
+class TestClaimGeneration:
+    """ClaimGenerationService orchestration, sharing mock extractors per class."""
+
+    @pytest.fixture(scope="class")
+    def mock_topic_extractor(self) -> AsyncMock:
+        """Mock TopicExtractor."""
+        return AsyncMock()
+
+    @pytest.fixture(scope="class")
+    def mock_claim_extractor(self) -> AsyncMock:
+        """Mock ClaimExtractor."""
+        return AsyncMock()
+
+    @pytest.fixture(scope="class")
+    def service(
+        self,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+    ) -> ClaimGenerationService:
+        """ClaimGenerationService with mocked extractors."""
+        return ClaimGenerationService(mock_topic_extractor, mock_claim_extractor)
+
+    @pytest.fixture(autouse=True)
+    def reset_mocks(
+        self, mock_topic_extractor: AsyncMock, mock_claim_extractor: AsyncMock
+    ) -> Iterator[None]:
+        """Clear canned results, recorded calls and replaced methods between tests."""
+        # reset_mock does not undo attribute assignment, so restore it by hand
+        extract_stream = mock_claim_extractor.extract_stream
+        yield
+        mock_claim_extractor.extract_stream = extract_stream
+        mock_topic_extractor.reset_mock(return_value=True, side_effect=True)
+        mock_claim_extractor.reset_mock(return_value=True, side_effect=True)
+
+    async def test_generate_claims_success(
+        self,
+        service: ClaimGenerationService,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """Service returns ClaimGenerationResponse with correct structure."""
+        mock_topic_extractor.extract.return_value = ["Topic A", "Topic B"]
+        mock_claim_extractor.extract.return_value = [
+            ClaimWithTopicBaseResult(
+                topic="Topic A",
+                claims=["Claim A1", "Claim A2"],
+            ),
+            ClaimWithTopicBaseResult(
+                topic="Topic B",
+                claims=["Claim B1"],
+            ),
+        ]
+
+        result = await service.generate_claims(sample_source_text)
+
+        assert isinstance(result, ClaimGenerationResponse)
+        assert len(result.claims) == 3
+        mock_topic_extractor.extract.assert_awaited_once_with(sample_source_text)
+        mock_claim_extractor.extract.assert_awaited_once()
+
+    async def test_generate_claims_empty_topics_raises(
+        self,
+        service: ClaimGenerationService,
+        mock_topic_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """Empty topic list raises EmptyExtractionError."""
+        mock_topic_extractor.extract.return_value = []
+
+        with pytest.raises(EmptyExtractionError):
+            await service.generate_claims(sample_source_text)
+
+    async def test_generate_claims_empty_claims_raises(
+        self,
+        service: ClaimGenerationService,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """Empty claims for all topics raises EmptyExtractionError."""
+        mock_topic_extractor.extract.return_value = ["Topic A"]
+        mock_claim_extractor.extract.return_value = [
+            ClaimWithTopicBaseResult(topic="Topic A", claims=[]),
+        ]
+
+        with pytest.raises(EmptyExtractionError):
+            await service.generate_claims(sample_source_text)
+
+    async def test_generate_claims_transforms_output_correctly(
+        self,
+        service: ClaimGenerationService,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """Verify flattening: 2 topics with 3+2 claims yields 5 ClaimResponse items."""
+        mock_topic_extractor.extract.return_value = ["Energy", "Policy"]
+        mock_claim_extractor.extract.return_value = [
+            ClaimWithTopicBaseResult(
+                topic="Energy",
+                claims=["Energy claim 1", "Energy claim 2", "Energy claim 3"],
+            ),
+            ClaimWithTopicBaseResult(
+                topic="Policy",
+                claims=["Policy claim 1", "Policy claim 2"],
+            ),
+        ]
+
+        result = await service.generate_claims(sample_source_text)
+
+        assert len(result.claims) == 5
+
+        # Check topic assignments
+        energy_claims = [c for c in result.claims if c.claim_topic == "Energy"]
+        policy_claims = [c for c in result.claims if c.claim_topic == "Policy"]
+        assert len(energy_claims) == 3
+        assert len(policy_claims) == 2
+        assert energy_claims[0].claim == "Energy claim 1"
+        assert policy_claims[1].claim == "Policy claim 2"
+
+    async def test_generate_claims_short_input_skips_topic_extraction(
+        self,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+    ) -> None:
+        """Inputs under min_words_for_topics go straight to claim extraction."""
+        mock_claim_extractor.extract.return_value = [
+            ClaimWithTopicBaseResult(topic=SINGLE_TOPIC_LABEL, claims=["Short claim"]),
+        ]
+        service = ClaimGenerationService(
+            mock_topic_extractor, mock_claim_extractor, min_words_for_topics=300
+        )
+
+        result = await service.generate_claims("A short note with one fact.")
+
+        assert result.claims[0].claim_topic == SINGLE_TOPIC_LABEL
+        mock_topic_extractor.extract.assert_not_awaited()
+        mock_claim_extractor.extract.assert_awaited_once_with(
+            "A short note with one fact.", [SINGLE_TOPIC_LABEL]
+        )
+
+    async def test_generate_claims_chunked_merges_by_topic(
+        self,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+    ) -> None:
+        """Long inputs are split into chunks whose claims merge per topic, deduplicated."""
+        mock_topic_extractor.extract.return_value = ["Energy", "Policy"]
+        mock_claim_extractor.extract.side_effect = [
+            [
+                ClaimWithTopicBaseResult(topic="Policy", claims=["P1"]),
+                ClaimWithTopicBaseResult(topic="Energy", claims=["E1"]),
+            ],
+            [
+                ClaimWithTopicBaseResult(topic="Energy", claims=["E1", "E2"]),
+                ClaimWithTopicBaseResult(topic="Extra", claims=["X1"]),
+            ],
+        ]
+        service = ClaimGenerationService(
+            mock_topic_extractor, mock_claim_extractor, claim_chunk_chars=40
+        )
+        source_text = "First paragraph about energy.\n\nSecond paragraph about policy."
+
+        result = await service.generate_claims(source_text)
+
+        assert [(c.claim_topic, c.claim) for c in result.claims] == [
+            ("Energy", "E1"),
+            ("Energy", "E2"),
+            ("Policy", "P1"),
+            ("Extra", "X1"),
+        ]
+        assert mock_claim_extractor.extract.await_count == 2
+
+    async def test_generate_claims_combined_single_call(
+        self,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """With a combined extractor, one call replaces the two-step pipeline."""
+        mock_combined_extractor = AsyncMock()
+        mock_combined_extractor.extract.return_value = [
+            ClaimWithTopicBaseResult(topic="Energy", claims=["Energy claim 1"]),
+            ClaimWithTopicBaseResult(topic="Policy", claims=["Policy claim 1"]),
+        ]
+        service = ClaimGenerationService(
+            mock_topic_extractor, mock_claim_extractor, mock_combined_extractor
+        )
+
+        result = await service.generate_claims(sample_source_text)
+
+        assert [c.claim_topic for c in result.claims] == ["Energy", "Policy"]
+        mock_combined_extractor.extract.assert_awaited_once_with(sample_source_text)
+        mock_topic_extractor.extract.assert_not_awaited()
+        mock_claim_extractor.extract.assert_not_awaited()
+
+    async def test_generate_claims_combined_via_micro_batcher(
+        self,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """With a micro-batcher, combined extraction is submitted to it."""
+        mock_combined_extractor = AsyncMock()
+        micro_batcher = AsyncMock()
+        micro_batcher.submit.return_value = [
+            ClaimWithTopicBaseResult(topic="Energy", claims=["Energy claim 1"]),
+        ]
+        service = ClaimGenerationService(
+            mock_topic_extractor,
+            mock_claim_extractor,
+            mock_combined_extractor,
+            micro_batcher=micro_batcher,
+        )
+
+        result = await service.generate_claims(sample_source_text)
+
+        assert [c.claim for c in result.claims] == ["Energy claim 1"]
+        micro_batcher.submit.assert_awaited_once()
+        mock_combined_extractor.extract.assert_not_awaited()
+
+    async def test_generate_claims_combined_empty_falls_back_to_two_step(
+        self,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """Combined extraction without claims is retried through the two-step pipeline."""
+        mock_combined_extractor = AsyncMock()
+        mock_combined_extractor.extract.return_value = [
+            ClaimWithTopicBaseResult(topic="Energy", claims=[]),
+        ]
+        mock_topic_extractor.extract.return_value = ["Energy"]
+        mock_claim_extractor.extract.return_value = [
+            ClaimWithTopicBaseResult(topic="Energy", claims=["Energy claim 1"]),
+        ]
+        service = ClaimGenerationService(
+            mock_topic_extractor, mock_claim_extractor, mock_combined_extractor
+        )
+
+        result = await service.generate_claims(sample_source_text)
+
+        assert [c.claim for c in result.claims] == ["Energy claim 1"]
+        mock_topic_extractor.extract.assert_awaited_once_with(sample_source_text)
+
+    async def test_generate_claims_combined_empty_raises(
+        self,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """Empty combined and two-step results raise EmptyExtractionError."""
+        mock_combined_extractor = AsyncMock()
+        mock_combined_extractor.extract.return_value = []
+        mock_topic_extractor.extract.return_value = []
+        service = ClaimGenerationService(
+            mock_topic_extractor, mock_claim_extractor, mock_combined_extractor
+        )
+
+        with pytest.raises(EmptyExtractionError):
+            await service.generate_claims(sample_source_text)
+
+    async def test_stream_claims_yields_deduplicated_claims(
+        self,
+        service: ClaimGenerationService,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """Streamed claims come from extract_stream, skipping repeated pairs."""
+        mock_topic_extractor.extract.return_value = ["Energy", "Policy"]
+        mock_claim_extractor.extract_stream = MagicMock(
+            return_value=_items(
+                ClaimWithTopicBaseResult(topic="Energy", claims=["E1", "E1"]),
+                ClaimWithTopicBaseResult(topic="Policy", claims=["P1"]),
+            )
+        )
+
+        claims = [c async for c in service.stream_claims(sample_source_text)]
+
+        assert [(c.claim_topic, c.claim) for c in claims] == [("Energy", "E1"), ("Policy", "P1")]
+        mock_claim_extractor.extract.assert_not_awaited()
+
+    async def test_stream_claims_empty_raises(
+        self,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """A stream that produced no claims raises EmptyExtractionError at the end."""
+        mock_combined_extractor = AsyncMock()
+        mock_combined_extractor.extract_stream = MagicMock(
+            return_value=_items(ClaimWithTopicBaseResult(topic="Energy", claims=[]))
+        )
+        mock_topic_extractor.extract.return_value = []
+        service = ClaimGenerationService(
+            mock_topic_extractor, mock_claim_extractor, mock_combined_extractor
+        )
+
+        with pytest.raises(EmptyExtractionError):
+            _ = [c async for c in service.stream_claims(sample_source_text)]
+
+    async def test_stream_claims_disabled_raises_before_extracting(
+        self,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """With streaming disabled (batch mode), no extractor is called."""
+        service = ClaimGenerationService(
+            mock_topic_extractor, mock_claim_extractor, streaming_enabled=False
+        )
+
+        with pytest.raises(StreamingUnavailableError):
+            _ = [c async for c in service.stream_claims(sample_source_text)]
+
+        mock_topic_extractor.extract.assert_not_awaited()
+
+    async def test_stream_claims_combined_empty_falls_back_to_two_step(
+        self,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """A combined stream with no claims is retried as a two-step stream."""
+        mock_combined_extractor = AsyncMock()
+        mock_combined_extractor.extract_stream = MagicMock(return_value=_items())
+        mock_topic_extractor.extract.return_value = ["Energy"]
+        mock_claim_extractor.extract_stream = MagicMock(
+            return_value=_items(ClaimWithTopicBaseResult(topic="Energy", claims=["E1"]))
+        )
+        service = ClaimGenerationService(
+            mock_topic_extractor, mock_claim_extractor, mock_combined_extractor
+        )
+
+        claims = [c async for c in service.stream_claims(sample_source_text)]
+
+        assert [(c.claim_topic, c.claim) for c in claims] == [("Energy", "E1")]
+        mock_topic_extractor.extract.assert_awaited_once_with(sample_source_text)
+
+    async def test_stream_claims_chunked_close_awaits_pending_chunks(
+        self,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+    ) -> None:
+        """Closing a chunked stream early finishes cancelling the chunks still running."""
+        cancelled = asyncio.Event()
+
+        async def _extract(chunk: str, topics: list[str]) -> list[ClaimWithTopicBaseResult]:
+            if chunk.startswith("First"):
+                return [ClaimWithTopicBaseResult(topic="Energy", claims=["E1"])]
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return []
+
+        mock_topic_extractor.extract.return_value = ["Energy"]
+        mock_claim_extractor.extract.side_effect = _extract
+        service = ClaimGenerationService(
+            mock_topic_extractor, mock_claim_extractor, claim_chunk_chars=40
+        )
+        source_text = "First paragraph about energy.\n\nSecond paragraph about policy."
+
+        stream = service.stream_claims(source_text)
+        assert isinstance(stream, AsyncGenerator)
+        first = await anext(stream)
+        await stream.aclose()
+
+        assert first.claim == "E1"
+        assert cancelled.is_set()
+
+    async def test_generate_claims_dedupes_repeated_pairs(
+        self,
+        service: ClaimGenerationService,
+        mock_topic_extractor: AsyncMock,
+        mock_claim_extractor: AsyncMock,
+        sample_source_text: str,
+    ) -> None:
+        """A topic repeated across items shares one str; duplicate pairs are dropped."""
+        mock_topic_extractor.extract.return_value = ["Energy"]
+        mock_claim_extractor.extract.return_value = [
+            ClaimWithTopicBaseResult(topic="Energy", claims=["E1", "E2"]),
+            ClaimWithTopicBaseResult(topic="".join(["Ener", "gy"]), claims=["E2", "E3"]),
+        ]
+
+        result = await service.generate_claims(sample_source_text)
+
+        assert [c.claim for c in result.claims] == ["E1", "E2", "E3"]
+        assert result.claims[0].claim_topic is result.claims[2].claim_topic
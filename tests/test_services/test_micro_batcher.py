@@ -0,0 +1,108 @@
+"""Tests for request micro-batching."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.exceptions import LLMProviderError, SafetyFilterError
+from src.schemas.llm import ClaimWithTopicBaseResult
+from src.services.micro_batcher import MicroBatcher
+
+
+def _topics(label: str) -> list[ClaimWithTopicBaseResult]:
+    return [ClaimWithTopicBaseResult(topic=label, claims=[f"{label} claim"])]
+
+
+async def test_concurrent_requests_share_one_call() -> None:
+    """Requests within the window are extracted together, each getting its own result."""
+    extract_one = AsyncMock()
+    extract_many = AsyncMock(side_effect=lambda texts: [_topics(text) for text in texts])
+    batcher = MicroBatcher(extract_one, extract_many, window_seconds=0.05, max_size=8)
+    batcher.start()
+    try:
+        results = await asyncio.gather(*(batcher.submit(text) for text in ("a", "b", "c")))
+    finally:
+        await batcher.close()
+
+    assert [result[0].topic for result in results] == ["a", "b", "c"]
+    extract_many.assert_awaited_once_with(["a", "b", "c"])
+    extract_one.assert_not_awaited()
+
+
+async def test_max_size_splits_batches() -> None:
+    """A full batch is dispatched without waiting for the rest of the window."""
+    extract_many = AsyncMock(side_effect=lambda texts: [_topics(text) for text in texts])
+    batcher = MicroBatcher(AsyncMock(), extract_many, window_seconds=0.05, max_size=2)
+    batcher.start()
+    try:
+        await asyncio.gather(*(batcher.submit(text) for text in ("a", "b", "c")))
+    finally:
+        await batcher.close()
+
+    assert extract_many.await_count == 1
+    assert extract_many.await_args_list[0].args == (["a", "b"],)
+
+
+async def test_failed_batch_falls_back_per_document() -> None:
+    """A failing batch is retried one by one, so only the bad document errors."""
+
+    async def _extract_one(text: str) -> list[ClaimWithTopicBaseResult]:
+        if text == "blocked":
+            raise SafetyFilterError()
+        return _topics(text)
+
+    extract_many = AsyncMock(side_effect=SafetyFilterError())
+    batcher = MicroBatcher(_extract_one, extract_many, window_seconds=0.05, max_size=8)
+    batcher.start()
+    try:
+        results = await asyncio.gather(
+            batcher.submit("ok"), batcher.submit("blocked"), return_exceptions=True
+        )
+    finally:
+        await batcher.close()
+
+    assert isinstance(results[0], list)
+    assert results[0][0].topic == "ok"
+    assert isinstance(results[1], SafetyFilterError)
+
+
+async def test_result_matching_another_document_falls_back_per_document() -> None:
+    """A claim drawn from a neighbouring document discards the batch result."""
+    texts = ["Glaciers retreat across Patagonia", "Bitcoin miners relocate to Texas"]
+    leaked = [_topics("Bitcoin miners"), _topics("Glaciers retreat")]
+    extract_many = AsyncMock(return_value=leaked)
+    extract_one = AsyncMock(side_effect=lambda text: _topics(text))
+    batcher = MicroBatcher(extract_one, extract_many, window_seconds=0.05, max_size=8)
+    batcher.start()
+    try:
+        results = await asyncio.gather(*(batcher.submit(text) for text in texts))
+    finally:
+        await batcher.close()
+
+    assert [result[0].topic for result in results] == texts
+    assert extract_one.await_count == 2
+
+
+async def test_close_fails_waiting_callers() -> None:
+    """Callers queued or in flight at shutdown get an error instead of hanging."""
+    started = asyncio.Event()
+
+    async def _extract_one(text: str) -> list[ClaimWithTopicBaseResult]:
+        started.set()
+        await asyncio.Event().wait()
+        return _topics(text)
+
+    batcher = MicroBatcher(_extract_one, AsyncMock(), window_seconds=0, max_size=1)
+    batcher.start()
+    in_flight = asyncio.ensure_future(batcher.submit("a"))
+    await started.wait()
+    queued = asyncio.ensure_future(batcher.submit("b"))
+    await asyncio.sleep(0)
+    await batcher.close()
+
+    for caller in (in_flight, queued):
+        with pytest.raises(LLMProviderError):
+            await asyncio.wait_for(caller, 1)
@@ -0,0 +1,119 @@
+"""Tests for the in-process response cache."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.utils.cache import ResponseCache
+
+
+def test_make_key_distinguishes_parts() -> None:
+    """Keys depend on every part and on part boundaries."""
+    assert ResponseCache.make_key("a", "bc") != ResponseCache.make_key("ab", "c")
+    assert ResponseCache.make_key("a", "b") == ResponseCache.make_key("a", "b")
+
+
+def test_lru_eviction() -> None:
+    """The least recently used entry is evicted when the cache is full."""
+    cache = ResponseCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_expired_entry_is_dropped(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Entries older than the TTL are treated as misses."""
+    now = 1000.0
+    monkeypatch.setattr("src.utils.cache.time.monotonic", lambda: now)
+    cache = ResponseCache(ttl_seconds=10)
+    cache.set("a", 1)
+
+    now = 1011.0
+    assert cache.get("a") is None
+
+
+async def test_get_or_compute_caches_result() -> None:
+    """A second lookup for the same key does not recompute."""
+    cache = ResponseCache()
+    calls = 0
+
+    async def _compute() -> str:
+        nonlocal calls
+        calls += 1
+        return "value"
+
+    assert await cache.get_or_compute("k", _compute) == "value"
+    assert await cache.get_or_compute("k", _compute) == "value"
+    assert calls == 1
+
+
+async def test_get_or_compute_coalesces_concurrent_misses() -> None:
+    """Concurrent misses for one key share a single computation."""
+    cache = ResponseCache()
+    calls = 0
+
+    async def _compute() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_compute("k", _compute) for _ in range(5)))
+
+    assert results == ["value"] * 5
+    assert calls == 1
+
+
+async def test_get_or_compute_does_not_cache_failures() -> None:
+    """An exception propagates and the next call computes again."""
+    cache = ResponseCache()
+
+    async def _fail() -> str:
+        raise RuntimeError("boom")
+
+    async def _ok() -> str:
+        return "value"
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_compute("k", _fail)
+    assert await cache.get_or_compute("k", _ok) == "value"
+
+
+async def test_get_or_compute_failure_keeps_waiters_serialized() -> None:
+    """After a failed compute, queued and newly arriving callers still share one lock."""
+    cache = ResponseCache()
+    calls = 0
+    running = 0
+    max_running = 0
+    late: list[asyncio.Task[str]] = []
+
+    async def _compute() -> str:
+        nonlocal calls, running, max_running
+        calls += 1
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0)
+        running -= 1
+        if calls == 1:
+            # Arrives right as the lock is released to the queued waiters
+            late.append(asyncio.create_task(cache.get_or_compute("k", _compute)))
+            raise RuntimeError("boom")
+        return "value"
+
+    results = await asyncio.gather(
+        *(cache.get_or_compute("k", _compute) for _ in range(3)), return_exceptions=True
+    )
+    results.append(await late[0])
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1:] == ["value"] * 3
+    assert calls == 2
+    assert max_running == 1
+    assert cache._locks == {}
@@ -0,0 +1,82 @@
+"""Tests for outermost-JSON extraction and partial JSON recovery."""
+
+from __future__ import annotations
+
+from src.utils.json_scan import ArrayItemScanner, extract_outermost_json, parse_partial_json
+
+
+def test_plain_json_returned_unchanged() -> None:
+    """Already-clean JSON is returned as-is."""
+    text = '{"topics": ["A", "B"]}'
+    assert extract_outermost_json(text) == text
+
+
+def test_code_fence_stripped() -> None:
+    """JSON wrapped in a markdown code fence is recovered."""
+    text = '```json\n{"topics": ["A"]}\n```'
+    assert extract_outermost_json(text) == '{"topics": ["A"]}'
+
+
+def test_trailing_prose_stripped() -> None:
+    """Prose after the JSON value is dropped."""
+    text = 'Here you go: {"topics": ["A"]} Let me know if you need more.'
+    assert extract_outermost_json(text) == '{"topics": ["A"]}'
+
+
+def test_brackets_inside_strings_ignored() -> None:
+    """Brackets and escaped quotes inside string literals do not affect depth."""
+    text = '{"claims": ["Uses {braces} and \\"quotes]\\""]} trailing'
+    assert extract_outermost_json(text) == '{"claims": ["Uses {braces} and \\"quotes]\\""]}'
+
+
+def test_top_level_array() -> None:
+    """A top-level array is balanced the same way as an object."""
+    assert extract_outermost_json('noise ["A", ["B"]] noise') == '["A", ["B"]]'
+
+
+def test_truncated_json_returns_none() -> None:
+    """An unterminated value cannot be balanced."""
+    assert extract_outermost_json('{"topics": ["A", "B"') is None
+
+
+def test_partial_json_closes_truncated_value() -> None:
+    """Truncated JSON after prose is closed, dropping the cut-off string."""
+    text = 'Here: {"topics": ["A", "Cut of'
+    assert parse_partial_json(text) == {"topics": ["A"]}
+
+
+def test_partial_json_malformed_returns_none() -> None:
+    """Malformed (not merely truncated) JSON is left to json_repair."""
+    assert parse_partial_json('{"topics": ["A",, "B"]}') is None
+    assert parse_partial_json("no json here") is None
+
+
+def test_no_json_returns_none() -> None:
+    """Text without any opening bracket yields None."""
+    assert extract_outermost_json("not json at all") is None
+
+
+def test_array_item_scanner_yields_items_across_chunks() -> None:
+    """Array elements are emitted once their closing brace has been fed."""
+    scanner = ArrayItemScanner()
+
+    assert scanner.feed('{"topics": [{"topic": "A", "cl') == []
+    assert scanner.feed('aims": ["x}"]}, {"topic"') == ['{"topic": "A", "claims": ["x}"]}']
+    assert scanner.feed(': "B", "claims": []}]}') == ['{"topic": "B", "claims": []}']
+
+
+def test_array_item_scanner_ignores_nested_objects() -> None:
+    """Only direct array elements are emitted, not objects nested inside them."""
+    scanner = ArrayItemScanner()
+
+    assert scanner.feed('{"items": [{"meta": {"k": 1}}]}') == ['{"meta": {"k": 1}}']
+
+
+def test_array_item_scanner_keeps_only_open_item() -> None:
+    """Text before the open element is dropped after each feed."""
+    scanner = ArrayItemScanner()
+
+    scanner.feed('{"topics": [{"topic": "A", "claims": []}, {"topic": "B"')
+    assert scanner._text == '{"topic": "B"'
+    assert scanner.feed(', "claims": []}]}') == ['{"topic": "B", "claims": []}']
+    assert scanner._text == ""
@@ -2,74 +2,66 @@
 
 from __future__ import annotations
 
-from src.utils.text import sanitize_source_text
-
-
-def test_smart_quotes_normalized() -> None:
-    """Smart/curly quotes are replaced with ASCII equivalents."""
-    text = "\u201cHello,\u201d she said. \u2018World.\u2019"
-    result = sanitize_source_text(text)
-    assert result == '"Hello," she said. \'World.\''
-
-
-def test_em_dash_normalized() -> None:
-    """Em dashes are replaced with double hyphens."""
-    text = "word\u2014another word"
-    result = sanitize_source_text(text)
-    assert result == "word--another word"
-
-
-def test_en_dash_normalized() -> None:
-    """En dashes are replaced with hyphens."""
-    text = "pages 10\u201320"
-    result = sanitize_source_text(text)
-    assert result == "pages 10-20"
-
-
-def test_ellipsis_normalized() -> None:
-    """Unicode ellipsis is replaced with three dots."""
-    text = "and so on\u2026"
-    result = sanitize_source_text(text)
-    assert result == "and so on..."
-
-
-def test_nbsp_normalized() -> None:
-    """Non-breaking space is replaced with regular space."""
-    text = "hello\u00a0world"
-    result = sanitize_source_text(text)
-    assert result == "hello world"
-
-
-def test_crlf_normalized() -> None:
-    """Windows line endings are normalized to Unix."""
-    text = "line one\r\nline two\r\nline three"
-    result = sanitize_source_text(text)
-    assert result == "line one\nline two\nline three"
-
-
-def test_excessive_newlines_collapsed() -> None:
-    """Three or more consecutive newlines are collapsed to two."""
-    text = "paragraph one\n\n\n\nparagraph two\n\n\n\n\nparagraph three"
-    result = sanitize_source_text(text)
-    assert result == "paragraph one\n\nparagraph two\n\nparagraph three"
-
-
-def test_double_newlines_preserved() -> None:
-    """Normal paragraph breaks (double newlines) are not altered."""
-    text = "paragraph one\n\nparagraph two"
-    result = sanitize_source_text(text)
-    assert result == "paragraph one\n\nparagraph two"
+import pytest
+
+from src.utils.text import sanitize_source_text, split_into_chunks
+
+SANITIZE_CASES = [
+    pytest.param(
+        "\u201cHello,\u201d she said. \u2018World.\u2019",
+        '"Hello," she said. \'World.\'',
+        id="smart-quotes",
+    ),
+    pytest.param("word\u2014another word", "word--another word", id="em-dash"),
+    pytest.param("pages 10\u201320", "pages 10-20", id="en-dash"),
+    pytest.param("and so on\u2026", "and so on...", id="ellipsis"),
+    pytest.param("hello\u00a0world", "hello world", id="nbsp"),
+    pytest.param(
+        "line one\r\nline two\r\nline three",
+        "line one\nline two\nline three",
+        id="crlf",
+    ),
+    pytest.param(
+        "paragraph one\n\n\n\nparagraph two\n\n\n\n\nparagraph three",
+        "paragraph one\n\nparagraph two\n\nparagraph three",
+        id="excessive-newlines-collapsed",
+    ),
+    pytest.param(
+        "paragraph one\n\nparagraph two",
+        "paragraph one\n\nparagraph two",
+        id="double-newlines-preserved",
+    ),
+    # The clean-ASCII shortcut must not skip whitespace compaction
+    pytest.param("one \ntwo\n", "one\ntwo", id="ascii-space-before-newline"),
+    pytest.param("one\n\n\ntwo", "one\n\ntwo", id="ascii-triple-newline"),
+    pytest.param("one\rtwo", "one\ntwo", id="ascii-lone-cr"),
+    pytest.param(
+        "\u201cHello\u201d \u2014 she said\u2026\r\n\r\n\r\nNext paragraph.",
+        '"Hello" -- she said...\n\nNext paragraph.',
+        id="combined",
+    ),
+    pytest.param(
+        "  Title\t\t here  \n   indented   line \n\n\n\nNext\u00a0 para  ",
+        "Title here\nindented line\n\nNext para",
+        id="horizontal-whitespace-compacted",
+    ),
+]
+
+
+@pytest.mark.parametrize(("text", "expected"), SANITIZE_CASES)
+def test_sanitize_source_text(text: str, expected: str) -> None:
+    """Unicode is mapped to ASCII and whitespace is compacted."""
+    assert sanitize_source_text(text) == expected
 
 
 def test_plain_ascii_unchanged() -> None:
     """Plain ASCII text passes through unmodified."""
     text = "Hello, world! This is a test. No special chars here."
     result = sanitize_source_text(text)
-    assert result == text
+    assert result is text
 
 
-def test_combined_sanitization() -> None:
-    """Multiple sanitization rules apply together."""
-    text = "\u201cHello\u201d \u2014 she said\u2026\r\n\r\n\r\nNext paragraph."
-    result = sanitize_source_text(text)
-    assert result == '"Hello" -- she said...\n\nNext paragraph.'
+def test_split_into_chunks_packs_paragraphs() -> None:
+    """Paragraphs are packed up to max_chars; oversized ones stand alone."""
+    text = "aaaa\n\nbbbb\n\ncccc\n\n" + "d" * 20
+    assert split_into_chunks(text, 10) == ["aaaa\n\nbbbb", "cccc", "d" * 20]